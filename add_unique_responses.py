@@ -4,6 +4,8 @@ Add genuinely unique responses extracted from the enhanced data
 """
 import pandas as pd
 
+from arrow_dataset import export_arrow
+
 def add_unique_responses():
     # Load existing dataset
     existing_df = pd.read_parquet('final_unified_responses.parquet')
@@ -134,6 +136,7 @@ def add_unique_responses():
     # Save updated files
     updated_df.to_parquet('updated_final_unified_responses.parquet')
     updated_df.to_csv('updated_final_yetifoam_responses.csv', index=False)
+    export_arrow('updated_final_unified_responses.parquet')
     
     print(f"Updated dataset saved with {len(updated_df)} total rows ({len(unique_entries)} added)")
     
@@ -11,6 +11,9 @@ from anthropic import Anthropic
 from typing import List, Dict
 import json
 
+from arrow_dataset import load_dataframe
+from keyword_automaton import KeywordAutomaton
+
 # Configure page
 st.set_page_config(
     page_title="YetiFoam Response Generator - AI Enhanced",
@@ -32,7 +35,8 @@ class AIEnhancedResponseGenerator:
             # Try to load the updated parquet file first
             dataset_path = "updated_final_unified_responses.parquet"
             if os.path.exists(dataset_path):
-                self.dataset = pd.read_parquet(dataset_path)
+                # Memory-mapped from the exported .arrow copy when it is current
+                self.dataset = load_dataframe(dataset_path)
             else:
                 # Fallback to CSV if parquet doesn't exist
                 dataset_path = "updated_final_yetifoam_responses.csv"
@@ -97,28 +101,40 @@ class AIEnhancedResponseGenerator:
         else:
             safety_priorities = []
         
+        query_words = [word for word in query_lower.split() if len(word) > 2]
+        
+        # Every keyword check below comes from one Aho-Corasick pass per row
+        row_automaton = KeywordAutomaton({
+            'query_words': query_words,
+            'safety': safety_keywords,
+            'safety_content': ['chemical', 'compatible', 'safe', 'fibres', 'particles'],
+            'terms': ['formaldehyde', 'no formaldehyde', 'polyurethane'] + [word for word, _ in safety_priorities]
+        })
+        
         for idx, row in self.dataset.iterrows():
             searchable_text = f"{row['category']} {row['subcategory']} {row['context_keywords']} {row['answer']}".lower()
+            hits = row_automaton.search(searchable_text)
+            matched_words = hits.get('query_words', set())
+            matched_terms = hits.get('terms', set())
             
             # Calculate relevance score
             score = 0
-            query_words = [word for word in query_lower.split() if len(word) > 2]
             
             # Base relevance from word matching
             for word in query_words:
-                if word in searchable_text:
+                if word in matched_words:
                     score += 2  # Increased base score
             
             # Special toxicity query handling
             if 'toxic' in query_lower:
                 # Massive boost for formaldehyde-free content
-                if 'formaldehyde' in searchable_text and 'no formaldehyde' in searchable_text:
+                if 'formaldehyde' in matched_terms and 'no formaldehyde' in matched_terms:
                     score += 20
                 # High boost for polyurethane safety content
-                elif 'polyurethane' in searchable_text:
+                elif 'polyurethane' in matched_terms:
                     score += 15
                 # Boost for other safety content
-                elif any(word in searchable_text for word in ['chemical', 'compatible', 'safe', 'fibres', 'particles']):
+                elif 'safety_content' in hits:
                     score += 8
             
             # General safety query bonuses
@@ -127,11 +143,11 @@ class AIEnhancedResponseGenerator:
                 if row['category'] == 'Fire Safety & Compliance':
                     score += 12
                 # Medium priority for safety keywords in any field
-                elif any(keyword in searchable_text for keyword in safety_keywords):
+                elif 'safety' in hits:
                     score += 6
                 # Apply special priority bonuses for toxicity queries
                 for priority_word, bonus in safety_priorities:
-                    if priority_word in searchable_text:
+                    if priority_word in matched_terms:
                         score += bonus
             
             # Only include entries with some relevance
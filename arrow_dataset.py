@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Arrow IPC (Feather v2) copies of the parquet datasets for zero-copy startup
+The pipeline writes an uncompressed .arrow file next to each parquet; loaders memory-map it so
+worker processes share the same page-cache buffers instead of each decoding the parquet
+"""
+import hashlib
+import os
+import sys
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pyarrow import feather
+
+from response_store import DICTIONARY_COLUMNS, ResponseStore
+
+# Schema metadata key recording which parquet content an .arrow file was exported from
+SOURCE_HASH_KEY = b'yetifoam.source_sha256'
+
+def dataset_content_hash(dataset_path: str) -> str:
+    """SHA-256 of the dataset file, used as its version"""
+    digest = hashlib.sha256()
+    with open(dataset_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def arrow_path_for(parquet_path: str) -> str:
+    """Path of the .arrow copy that sits next to a parquet dataset"""
+    return os.path.splitext(parquet_path)[0] + '.arrow'
+
+def export_arrow(parquet_path: str, arrow_path: str = None) -> str:
+    """Write the memory-mappable Arrow copy of a parquet dataset; returns its path"""
+    arrow_path = arrow_path or arrow_path_for(parquet_path)
+    table = pq.read_table(parquet_path)
+
+    # Low-cardinality columns go in dictionary-encoded so the store can map their codes directly
+    for name in DICTIONARY_COLUMNS:
+        if name in table.column_names and not pa.types.is_dictionary(table.schema.field(name).type):
+            position = table.column_names.index(name)
+            table = table.set_column(position, name, table.column(name).dictionary_encode())
+
+    metadata = dict(table.schema.metadata or {})
+    metadata[SOURCE_HASH_KEY] = dataset_content_hash(parquet_path).encode()
+    table = table.replace_schema_metadata(metadata)
+
+    # Uncompressed (compressed buffers cannot be mapped) and swapped in atomically for running readers
+    temp_path = arrow_path + '.tmp'
+    feather.write_feather(table, temp_path, compression='uncompressed')
+    os.replace(temp_path, arrow_path)
+    return arrow_path
+
+def map_arrow(arrow_path: str) -> pa.Table:
+    """Memory-mapped table; column buffers point into the file rather than the process heap"""
+    source = pa.memory_map(arrow_path, 'r')
+    return pa.ipc.open_file(source).read_all()
+
+def open_dataset_table(parquet_path: str, content_hash: str = None) -> pa.Table:
+    """Arrow table for a dataset - mapped from its .arrow copy when current, decoded from the parquet otherwise"""
+    arrow_path = arrow_path_for(parquet_path)
+    if os.path.exists(arrow_path):
+        table = map_arrow(arrow_path)
+        content_hash = content_hash or dataset_content_hash(parquet_path)
+        # A copy exported from older parquet content is ignored rather than served stale
+        if (table.schema.metadata or {}).get(SOURCE_HASH_KEY) == content_hash.encode():
+            return table
+    return pq.read_table(parquet_path)
+
+def load_response_store(parquet_path: str, content_hash: str = None) -> ResponseStore:
+    """ResponseStore over the dataset's columns (text stays in the mapped buffers)"""
+    return ResponseStore.from_arrow(open_dataset_table(parquet_path, content_hash))
+
+def load_dataframe(parquet_path: str, content_hash: str = None):
+    """pandas DataFrame for the dataset; Arrow-backed columns avoid copying mapped data"""
+    import pandas as pd
+
+    return open_dataset_table(parquet_path, content_hash).to_pandas(types_mapper=pd.ArrowDtype)
+
+if __name__ == "__main__":
+    for path in sys.argv[1:] or ['unified_responses.parquet']:
+        print(f"Wrote {export_arrow(path)}")
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Search latency benchmark for the response engines
+Runs CompleteMatcher, SemanticMatcher and the app's search_responses over the test query lists
+at several dataset sizes (the real rows topped up with synthetic ones) and reports p50/p95/p99
+latency and throughput as JSON
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+import pyarrow.parquet as pq
+
+from complete_semantic_matcher import CompleteMatcher
+from dataset_cleaner import detect_corruption
+from enhanced_matcher import SemanticMatcher
+from query_cache import QueryCache
+from synthetic_corpus import CorpusProfile, generate_corpus, generate_queries, write_corpus
+from test_app_queries import CHALLENGING_QUERIES
+from yetifoam_advanced_tester_v4 import PROBLEMATIC_QUERIES
+from yetifoam_enhanced_final_streamlit_app import YetifoamEnhancedResponseGenerator
+from yetifoam_simple_enhanced_tester import ENHANCED_TEST_QUERIES
+
+DEFAULT_SIZES = (67, 1_000, 10_000, 100_000)
+ENGINES = ('complete_matcher', 'semantic_matcher', 'app_search')
+
+# The same query lists the pass/fail testers use, in a fixed order
+BENCHMARK_QUERIES = list(dict.fromkeys(
+    CHALLENGING_QUERIES + ENHANCED_TEST_QUERIES +
+    [query for group in PROBLEMATIC_QUERIES.values() for query in group]
+))
+
+def write_scaled_dataset(source_path: str, size: int, directory: str, seed: int = 0) -> str:
+    """Write the real rows topped up with seeded synthetic rows to `size` as parquet in `directory`; returns its path"""
+    profile = CorpusProfile(source_path)
+    records = pq.read_table(source_path).to_pylist()[:size]
+    records += generate_corpus(size - len(records), seed, profile)
+    path = os.path.join(directory, f"benchmark_{size}.parquet")
+    write_corpus(path, records, profile.schema, arrow=False)
+    return path
+
+def latency_summary(latencies: List[float], wall_seconds: float) -> Dict[str, Any]:
+    """Percentiles in milliseconds plus queries per second over the measured run"""
+    milliseconds = np.asarray(latencies) * 1000
+    return {
+        'queries_run': len(latencies),
+        'latency_ms': {
+            'p50': round(float(np.percentile(milliseconds, 50)), 3),
+            'p95': round(float(np.percentile(milliseconds, 95)), 3),
+            'p99': round(float(np.percentile(milliseconds, 99)), 3),
+            'mean': round(float(milliseconds.mean()), 3),
+            'max': round(float(milliseconds.max()), 3)
+        },
+        'throughput_qps': round(len(latencies) / wall_seconds, 3) if wall_seconds else None
+    }
+
+def time_queries(search: Callable[[str], Any], queries: List[str], repeat: int = 1,
+                 time_budget: float = None) -> Dict[str, Any]:
+    """Run every query `repeat` times (stopping early once `time_budget` seconds are spent)"""
+    # One untimed query so lazy imports and first-call setup are not counted
+    search(queries[0])
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for query in queries:
+            query_start = time.perf_counter()
+            search(query)
+            latencies.append(time.perf_counter() - query_start)
+            if time_budget is not None and time.perf_counter() - started >= time_budget:
+                break
+        else:
+            continue
+        break
+    summary = latency_summary(latencies, time.perf_counter() - started)
+    summary['stopped_early'] = len(latencies) < repeat * len(queries)
+    return summary
+
+def build_engine(engine: str, dataset_path: str) -> Callable[[str], Any]:
+    """Search function for one engine over the dataset (result caching disabled)
+
+    Engines load only `dataset_path` and build their index from scratch (no snapshot is read or
+    written), so setup_seconds is a cold build for every engine.
+    """
+    if engine == 'complete_matcher':
+        matcher = CompleteMatcher(dataset_path, use_snapshot=False)
+        matcher.cache = QueryCache(max_entries=0)
+        return lambda query: matcher.find_best_with_alternatives(query, 3)
+    if engine == 'semantic_matcher':
+        matcher = SemanticMatcher(dataset_path)
+        return lambda query: matcher.find_best_matches(query)
+    if engine == 'app_search':
+        generator = YetifoamEnhancedResponseGenerator(dataset_path, use_index_snapshot=False)
+        generator.complete_matcher.cache = QueryCache(max_entries=0)
+        return lambda query: generator.search_responses(query, max_results=5)
+    raise ValueError(f"Unknown engine '{engine}', expected one of {ENGINES}")
+
+def run_benchmark(dataset_path: str, sizes=DEFAULT_SIZES, engines=ENGINES, queries: List[str] = None,
+                  repeat: int = 1, time_budget: float = None, seed: int = 0) -> Dict[str, Any]:
+    """Benchmark every engine at every dataset size; returns the JSON-ready report"""
+    queries = queries or BENCHMARK_QUERIES
+    report = {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'dataset': os.path.basename(dataset_path),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'workload': 'tester query lists' if queries is BENCHMARK_QUERIES else 'custom',
+        'query_count': len(queries),
+        'repeat': repeat,
+        'time_budget_seconds': time_budget,
+        'seed': seed,
+        'results': []
+    }
+    with tempfile.TemporaryDirectory(prefix='yetifoam-bench-') as directory:
+        for size in sizes:
+            path = write_scaled_dataset(dataset_path, size, directory, seed)
+            for engine in engines:
+                print(f"{engine} @ {size} rows...", flush=True)
+                # The engines log every query; keep that out of the timings
+                with contextlib.redirect_stdout(io.StringIO()):
+                    setup_start = time.perf_counter()
+                    search = build_engine(engine, path)
+                    setup_seconds = time.perf_counter() - setup_start
+                    summary = time_queries(search, queries, repeat, time_budget)
+                result = {'engine': engine, 'dataset_rows': size, 'setup_seconds': round(setup_seconds, 3)}
+                result.update(summary)
+                report['results'].append(result)
+                latency = result['latency_ms']
+                print(f"  p50 {latency['p50']:.1f} ms | p95 {latency['p95']:.1f} ms | p99 {latency['p99']:.1f} ms | "
+                      f"{result['throughput_qps']:.1f} q/s ({result['queries_run']} queries)", flush=True)
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--dataset', default='unified_responses.parquet', help="parquet dataset to scale from")
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)), help="comma-separated row counts")
+    parser.add_argument('--engines', default=','.join(ENGINES), help="comma-separated subset of " + ', '.join(ENGINES))
+    parser.add_argument('--repeat', type=int, default=1, help="passes over the query list")
+    parser.add_argument('--time-budget', type=float, default=30.0,
+                        help="seconds per engine and size before the remaining queries are skipped")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--synthetic-queries', type=int, default=0,
+                        help="benchmark this many generated queries (with typo/paraphrase variants) instead of the tester lists")
+    parser.add_argument('--output', default=None, help="JSON results file (default: timestamped in the current directory)")
+    args = parser.parse_args()
+
+    queries = None
+    if args.synthetic_queries:
+        # Drawn from the real rows so every dataset size answers the same workload
+        real_records = [record for record in pq.read_table(args.dataset).to_pylist()
+                        if record.get('original_query') and not detect_corruption(record['original_query'])]
+        queries = [entry['query'] for entry in generate_queries(real_records, args.synthetic_queries, args.seed)]
+
+    report = run_benchmark(
+        args.dataset,
+        queries=queries,
+        sizes=[int(size) for size in args.sizes.split(',')],
+        engines=args.engines.split(','),
+        repeat=args.repeat,
+        time_budget=args.time_budget,
+        seed=args.seed
+    )
+    output = args.output or f"benchmark_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(output, 'w', encoding='utf-8') as file:
+        json.dump(report, file, indent=2)
+    print(f"\n📁 Benchmark results saved to: {output}")
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Sparse BM25 retriever for Yetifoam responses
+First-stage ranking as a sparse dot product; fuzzy scorers only re-rank its top candidates
+"""
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+import numpy as np
+from scipy import sparse
+
+class BM25Retriever:
+    """BM25 index over response, original_query and category, built at load time and extended incrementally
+
+    add_documents and compacted only change the retriever they are called on; the matcher applies them
+    to a fork that no other thread is searching and swaps it in when done.
+    """
+
+    def __init__(self, responses: List[Dict[str, Any]], tokenizer: Callable[[str], List[str]],
+                 field_weights: Dict[str, float] = None, k1: float = 1.5, b: float = 0.75):
+        # Same tokenizer as the matcher's inverted index so expanded query tokens line up
+        self.tokenizer = tokenizer
+        # Field boosts are applied to term frequencies (BM25F style)
+        self.field_weights = field_weights or {'response': 1.0, 'original_query': 2.0, 'category': 1.0}
+        self.k1 = k1
+        self.b = b
+        self.vocabulary = {}
+        self.n_docs = 0
+
+        # Raw (doc, term, tf) triples are kept so rows can be added or dropped without re-tokenizing the rest
+        self.doc_ids = np.zeros(0, dtype=np.int64)
+        self.term_ids = np.zeros(0, dtype=np.int64)
+        self.term_freqs = np.zeros(0, dtype=np.float32)
+        self.doc_lengths = np.zeros(0, dtype=np.float32)
+        # (idf, term x doc weight matrix), rebuilt on the first search after the documents change
+        self._weights = None
+        self.add_documents(responses)
+        self._current_weights()
+
+    def add_documents(self, responses: Iterable[Dict[str, Any]]):
+        """Tokenize new documents (row ids continue from n_docs); idf and length normalization are
+        refreshed once on the next search, however many batches were added"""
+        doc_ids, term_ids, term_freqs, doc_lengths = [], [], [], []
+        for doc_id, response_item in enumerate(responses, start=self.n_docs):
+            counts = Counter()
+            for field, weight in self.field_weights.items():
+                for token in self.tokenizer(response_item.get(field) or ''):
+                    counts[token] += weight
+            doc_lengths.append(sum(counts.values()))
+            for token, tf in counts.items():
+                doc_ids.append(doc_id)
+                term_ids.append(self.vocabulary.setdefault(token, len(self.vocabulary)))
+                term_freqs.append(tf)
+
+        if doc_lengths:
+            self.doc_ids = np.concatenate([self.doc_ids, np.array(doc_ids, dtype=np.int64)])
+            self.term_ids = np.concatenate([self.term_ids, np.array(term_ids, dtype=np.int64)])
+            self.term_freqs = np.concatenate([self.term_freqs, np.array(term_freqs, dtype=np.float32)])
+            self.doc_lengths = np.concatenate([self.doc_lengths, np.array(doc_lengths, dtype=np.float32)])
+            self.n_docs += len(doc_lengths)
+            self._weights = None
+
+    def copy(self) -> 'BM25Retriever':
+        """Independent retriever for copy-on-write updates (stored arrays are shared; they are never modified in place)"""
+        retriever = BM25Retriever.__new__(BM25Retriever)
+        retriever.__dict__.update(self.__dict__)
+        # add_documents extends the vocabulary in place
+        retriever.vocabulary = dict(self.vocabulary)
+        return retriever
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Index snapshots carry the weight matrix so a loaded retriever can search straight away
+        self._current_weights()
+        return self.__dict__
+
+    def compacted(self, keep_ids: List[int]) -> 'BM25Retriever':
+        """Copy holding only keep_ids, renumbered in that order (statistics recomputed, nothing re-tokenized)"""
+        keep_ids = np.asarray(keep_ids, dtype=np.int64)
+        new_ids = np.full(self.n_docs, -1, dtype=np.int64)
+        new_ids[keep_ids] = np.arange(len(keep_ids))
+        kept = new_ids[self.doc_ids] >= 0
+
+        retriever = self.copy()
+        retriever.doc_ids = new_ids[self.doc_ids[kept]]
+        retriever.term_ids = self.term_ids[kept]
+        retriever.term_freqs = self.term_freqs[kept]
+        retriever.doc_lengths = self.doc_lengths[keep_ids]
+        retriever.n_docs = len(keep_ids)
+        retriever._weights = None
+        return retriever
+
+    def _current_weights(self) -> Tuple[np.ndarray, sparse.csr_matrix]:
+        """idf and the (term x doc) BM25 weight matrix, recomputed from the stored term frequencies when stale
+
+        Only reads the stored arrays and replaces the cached pair in one assignment, so concurrent
+        searches at worst build it twice.
+        """
+        weights = self._weights
+        if weights is not None:
+            return weights
+
+        n_docs, doc_ids, term_ids, tf, doc_lengths = self.n_docs, self.doc_ids, self.term_ids, self.term_freqs, self.doc_lengths
+        avg_doc_length = float(doc_lengths.mean()) if n_docs and doc_lengths.mean() > 0 else 1.0
+
+        # Robertson/Sparck Jones idf with the +1 smoothing that keeps it positive
+        doc_freq = np.bincount(term_ids, minlength=len(self.vocabulary)).astype(np.float32)
+        idf = np.log1p((n_docs - doc_freq + 0.5) / (doc_freq + 0.5))
+
+        # Precompute the full per-(term, doc) BM25 contribution so a query is a single sparse product
+        length_norm = self.k1 * (1 - self.b + self.b * doc_lengths[doc_ids] / avg_doc_length) if len(doc_ids) else tf
+        doc_weights = idf[term_ids] * tf * (self.k1 + 1) / (tf + length_norm)
+        term_doc = sparse.csr_matrix(
+            (doc_weights, (term_ids, doc_ids)), shape=(len(self.vocabulary), n_docs), dtype=np.float32
+        )
+        self._weights = weights = (idf, term_doc)
+        return weights
+
+    @property
+    def idf(self) -> np.ndarray:
+        return self._current_weights()[0]
+
+    @property
+    def term_doc(self) -> sparse.csr_matrix:
+        return self._current_weights()[1]
+
+    def score_tokens(self, tokens: Iterable[str]) -> np.ndarray:
+        """BM25 score of every document for a bag of query tokens"""
+        _, term_doc = self._current_weights()
+        term_ids = sorted({self.vocabulary[token] for token in tokens if token in self.vocabulary})
+        if not term_ids or not self.n_docs:
+            return np.zeros(self.n_docs, dtype=np.float32)
+
+        query_vector = sparse.csr_matrix(
+            (np.ones(len(term_ids), dtype=np.float32), (np.zeros(len(term_ids), dtype=np.int64), term_ids)),
+            shape=(1, term_doc.shape[0])
+        )
+        return (query_vector @ term_doc).toarray().ravel()
+
+    def score(self, query: str) -> np.ndarray:
+        """BM25 score of every document for a raw query"""
+        return self.score_tokens(self.tokenizer(query))
+
+    def top_k_tokens(self, tokens: Iterable[str], k: int = 50) -> List[Tuple[int, float]]:
+        """Best k (row id, score) pairs with a non-zero score, best first"""
+        scores = self.score_tokens(tokens)
+        matched = np.flatnonzero(scores)
+        if k < 1 or not len(matched):
+            return []
+
+        if len(matched) > k:
+            matched = matched[np.argpartition(-scores[matched], k - 1)[:k]]
+        # Highest score first, dataset order on ties
+        ordered = matched[np.lexsort((matched, -scores[matched]))]
+        return [(int(row_id), float(scores[row_id])) for row_id in ordered]
+
+    def top_k(self, query: str, k: int = 50) -> List[Tuple[int, float]]:
+        """Best k (row id, score) pairs for a raw query"""
+        return self.top_k_tokens(self.tokenizer(query), k)
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Process-pool execution for bulk query processing
+Queries are sharded across worker processes that each load the matcher once (memory-mapped .arrow
+copy plus index snapshot, so start-up is cheap and the pages are shared); results stream back in
+input order with the time each query took
+"""
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Tuple
+
+# The matcher each worker process loads in its initializer
+_worker_matcher = None
+
+def _init_worker(dataset_path: str):
+    global _worker_matcher
+    # The matcher logs every query; worker output would only flood the server log
+    sys.stdout = open(os.devnull, 'w')
+    from complete_semantic_matcher import CompleteMatcher
+    _worker_matcher = CompleteMatcher(dataset_path)
+
+def search_queries(matcher, queries: List[str], count: int = 3,
+                   retriever: str = 'fuzzy') -> Iterator[Tuple[Tuple[Dict[str, Any], List[Dict[str, Any]]], float]]:
+    """Yield the best match and alternatives plus elapsed seconds for every query, in order
+
+    Workers run this on each shard and the app runs it on whatever the pool does not serve, so a
+    job gets the same answers however it is split.
+    """
+    for query in queries:
+        start = time.perf_counter()
+        matches = matcher.find_best_with_alternatives(query, count, retriever)
+        yield matches, time.perf_counter() - start
+
+def _search_shard(queries: List[str], count: int, retriever: str,
+                  dataset_version: str) -> List[Tuple[Tuple[Dict[str, Any], List[Dict[str, Any]]], float]]:
+    if _worker_matcher.dataset_version != dataset_version:
+        # The file changed after the pool was started; the caller falls back to its own matcher
+        raise RuntimeError("Bulk worker loaded a different dataset version")
+    return list(search_queries(_worker_matcher, queries, count, retriever))
+
+class BulkExecutor:
+    """Worker pool bound to one dataset version"""
+
+    def __init__(self, dataset_path: str, dataset_version: str, max_workers: int = None, shard_size: int = 8):
+        self.dataset_path = dataset_path
+        self.dataset_version = dataset_version
+        self.max_workers = max_workers or os.cpu_count() or 1
+        # Small shards keep results flowing back early and balance uneven query costs
+        self.shard_size = shard_size
+        # spawn, not fork: the app process runs Streamlit and watcher threads
+        self._pool = ProcessPoolExecutor(
+            self.max_workers, mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker, initargs=(dataset_path,)
+        )
+
+    def map(self, queries: List[str], count: int = 3,
+            retriever: str = 'fuzzy') -> Iterator[Tuple[str, Tuple[Dict[str, Any], List[Dict[str, Any]]], float]]:
+        """Yield (query, (best_result, top_matches), seconds) in input order as shards finish
+
+        Every shard is queued up front so all workers stay busy; a worker error is raised here.
+        """
+        starts = range(0, len(queries), self.shard_size)
+        futures = [
+            self._pool.submit(_search_shard, queries[start:start + self.shard_size], count, retriever, self.dataset_version)
+            for start in starts
+        ]
+        try:
+            for start, future in zip(starts, futures):
+                for query, (matches, seconds) in zip(queries[start:start + self.shard_size], future.result()):
+                    yield query, matches, seconds
+        finally:
+            # Abandoned or failed runs do not leave queued shards behind
+            for future in futures:
+                future.cancel()
+
+    def shutdown(self, wait: bool = False):
+        self._pool.shutdown(wait=wait, cancel_futures=True)
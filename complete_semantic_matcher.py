@@ -3,18 +3,244 @@
 Complete semantic matcher - evaluates ALL 67 responses for every query
 Treats each response as unique and non-overlapping
 """
-import pandas as pd
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Optional, Tuple, Any
 from fuzzywuzzy import fuzz
+import numpy as np
+from functools import partial
+from operator import itemgetter
+from collections import defaultdict
+import copy
+import hashlib
+import heapq
+import itertools
+import json
+import os
 import re
 
+from arrow_dataset import dataset_content_hash, export_arrow, load_response_store
+from dataset_cleaner import flag_corrupted_records, has_current_corruption_flags
+from index_snapshot import load_snapshot, save_snapshot, snapshot_path_for
+from keyword_automaton import KeywordAutomaton
+from query_cache import canonicalize_query, search_cache
+from startup_timing import timed
+from text_normalizer import NORMALIZER_VERSION
+
+try:
+    from bm25_retriever import BM25Retriever
+    BM25_AVAILABLE = True
+except ImportError:
+    BM25_AVAILABLE = False
+
+# First-stage retrievers selectable per search
+RETRIEVERS = ('fuzzy', 'bm25')
+
+# Bump whenever tokenize, STOP_WORDS or the ResponseIndex/BM25 layout change so saved index snapshots are rebuilt
+INDEX_FORMAT_VERSION = 4
+
+# Distinguishes the cache versions of successive in-memory updates to the same dataset file
+_update_counter = itertools.count(1)
+
+# Words too common to narrow the candidate set
+STOP_WORDS = {
+    'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are', 'was', 'were',
+    'a', 'an', 'it', 'its', 'i', 'me', 'my', 'we', 'our', 'you', 'your', 'they', 'them', 'this', 'that',
+    'there', 'what', 'how', 'about', 'does', 'do', 'can', 'be', 'would', 'will', 'if', 'so', 'as', 'from',
+    'has', 'have', 'any', 'not', 'no', 'under', 'into', 'than', 'then', 'also', 'just'
+}
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens with stop words dropped and simple plural folding"""
+    tokens = []
+    for token in re.findall(r'[a-z0-9]+', text.lower()):
+        if token in STOP_WORDS or len(token) < 2:
+            continue
+        if len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+def popcount(values):
+    """Number of set bits in every element of an integer array"""
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(values)
+    # NumPy < 2.0: shift through the (few) context bits
+    values = values.copy()
+    counts = np.zeros(values.shape, dtype=np.int64)
+    while values.any():
+        counts += values & 1
+        values >>= 1
+    return counts
+
+def context_jaccard(query_mask: int, response_mask: int) -> float:
+    """Context overlap (0-100) of two context bitmasks; 0 when either side has no context"""
+    if not query_mask or not response_mask:
+        return 0
+    return bin(query_mask & response_mask).count('1') / bin(query_mask | response_mask).count('1') * 100
+
+class ResponseIndex:
+    """Dataset-side features for every response, computed once at load time"""
+    
+    def __init__(self, responses: List[Dict[str, Any]], get_context, context_names: List[str]):
+        self.get_context = get_context
+        self.context_bits = {name: 1 << position for position, name in enumerate(context_names)}
+        self.response_text = []
+        self.response_norm = []
+        self.orig_query_norm = []
+        self.category_norm = []
+        self.response_tokens = []
+        self.postings = defaultdict(list)
+        self.contexts = []
+        self.context_mask_list = []
+        self._context_masks = None
+        self.category_ids = []
+        self.categories = []
+        self._category_lookup = {}
+        self.excluded = set()
+        self._live_ids = None
+        
+        for response_item in responses:
+            self.add(response_item)
+        # Tombstoned store rows are never scored either
+        self.excluded.update(getattr(responses, 'deleted', ()))
+    
+    def __len__(self) -> int:
+        return len(self.response_norm)
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        # The context callback belongs to the owning matcher and is reattached after loading a snapshot
+        state = self.__dict__.copy()
+        state['get_context'] = None
+        return state
+    
+    def add(self, response_item: Dict[str, Any]) -> int:
+        """Normalize one response and append its features, returning its row id"""
+        response_text = response_item.get('response', '') or ''
+        original_query = response_item.get('original_query', '') or ''
+        category = response_item.get('category', '') or ''
+        
+        response_norm = response_text.lower()
+        
+        self.response_text.append(response_text)
+        self.response_norm.append(response_norm)
+        self.orig_query_norm.append(original_query.lower())
+        self.category_norm.append(category.lower())
+        self.response_tokens.append(frozenset(tokenize(response_text)))
+        contexts = frozenset(self.get_context(response_text + " " + original_query))
+        self.contexts.append(contexts)
+        self.context_mask_list.append(self.context_mask(contexts))
+        self._context_masks = None
+        
+        if category not in self._category_lookup:
+            self._category_lookup[category] = len(self.categories)
+            self.categories.append(category)
+        self.category_ids.append(self._category_lookup[category])
+        
+        row_id = len(self.response_norm) - 1
+        self._live_ids = None
+        
+        # Token -> row id postings over every scored field
+        for token in self.response_tokens[row_id] | set(tokenize(original_query + " " + category)):
+            self.postings[token].append(row_id)
+        
+        return row_id
+    
+    def remove(self, row_id: int):
+        """Tombstone a row: it stays in the arrays (ids are stable) but is never scored again"""
+        self.excluded.add(row_id)
+        self._live_ids = None
+    
+    def copy(self) -> 'ResponseIndex':
+        """Independent copy for copy-on-write updates (per-row lists and postings are copied, not rebuilt)"""
+        index = copy.copy(self)
+        for name in ('response_text', 'response_norm', 'orig_query_norm', 'category_norm', 'response_tokens',
+                     'contexts', 'context_mask_list', 'category_ids', 'categories'):
+            setattr(index, name, list(getattr(self, name)))
+        index.postings = defaultdict(list, {token: list(rows) for token, rows in self.postings.items()})
+        index._category_lookup = dict(self._category_lookup)
+        index.excluded = set(self.excluded)
+        return index
+    
+    def compacted(self, keep_ids: List[int]) -> 'ResponseIndex':
+        """Index holding only keep_ids, renumbered in that order (features are reused, not recomputed)"""
+        new_ids = {old: new for new, old in enumerate(keep_ids)}
+        index = copy.copy(self)
+        for name in ('response_text', 'response_norm', 'orig_query_norm', 'category_norm', 'response_tokens',
+                     'contexts', 'context_mask_list', 'category_ids'):
+            values = getattr(self, name)
+            setattr(index, name, [values[old] for old in keep_ids])
+        index.categories = list(self.categories)
+        index._category_lookup = dict(self._category_lookup)
+        index.postings = defaultdict(list)
+        for token, rows in self.postings.items():
+            kept = [new_ids[row_id] for row_id in rows if row_id in new_ids]
+            if kept:
+                index.postings[token] = sorted(kept)
+        index.excluded = {new_ids[row_id] for row_id in self.excluded if row_id in new_ids}
+        index._context_masks = None
+        index._live_ids = None
+        return index
+    
+    def live_ids(self) -> List[int]:
+        """Row ids that may be scored, in dataset order"""
+        if self._live_ids is None:
+            self._live_ids = [row_id for row_id in range(len(self)) if row_id not in self.excluded]
+        return self._live_ids
+    
+    def context_mask(self, contexts) -> int:
+        """Bitmask with one bit per context group"""
+        mask = 0
+        for context in contexts:
+            mask |= self.context_bits[context]
+        return mask
+    
+    @property
+    def context_masks(self):
+        """Context bitmask of every row as a NumPy array (rebuilt after rows are added)"""
+        if self._context_masks is None:
+            self._context_masks = np.array(self.context_mask_list, dtype=np.int64)
+        return self._context_masks
+    
+    def context_scores(self, query_mask: int):
+        """Context overlap (0-100) of a query against every row in one vectorized pass"""
+        masks = self.context_masks
+        if not query_mask:
+            return np.zeros(len(masks))
+        # Popcounts of AND/OR give the Jaccard; the union is never empty with a non-zero query mask
+        scores = popcount(masks & query_mask) / popcount(masks | query_mask) * 100
+        return np.where(masks != 0, scores, 0)
+    
+    def candidates(self, tokens) -> List[int]:
+        """Row ids sharing at least one token with the query, most shared tokens first (dataset order on ties)"""
+        overlap = defaultdict(int)
+        for token in set(tokens):
+            for row_id in self.postings.get(token, ()):
+                overlap[row_id] += 1
+        return sorted(
+            (row_id for row_id in overlap if row_id not in self.excluded),
+            key=lambda row_id: (-overlap[row_id], row_id)
+        )
+
 class CompleteMatcher:
-    def __init__(self, dataset_path: str = 'unified_responses.parquet'):
+    def __init__(self, dataset_path: str = 'unified_responses.parquet', use_snapshot: bool = True):
         """Initialize with complete unified dataset"""
-        self.df = pd.read_parquet(dataset_path)
-        self.responses = self.df.to_dict('records')
+        # Search results are cached per dataset version and dropped when the file content changes
+        self.dataset_path = dataset_path
+        self.dataset_version = dataset_content_hash(dataset_path)
+        # Version of the file as loaded; add/remove give dataset_version a new value, this stays put
+        self.source_version = self.dataset_version
+        self.cache = search_cache
+        
+        # Columnar store with integer row ids, memory-mapped from the .arrow copy when it is current
+        with timed("load response store"):
+            self.responses = load_response_store(dataset_path, self.dataset_version)
         print(f"Loaded {len(self.responses)} unique responses for matching")
         
+        # Corruption is flagged once per dataset (normally stored by the build) instead of per query.
+        # Only the app's fuzzy search skips flagged rows: the patterns also match ordinary phrases
+        # like "phone call", so the matcher itself still scores every row.
+        if not has_current_corruption_flags(self.responses):
+            flag_corrupted_records(self.responses)
+        
         # Semantic context mapping
         self.context_keywords = {
             'safety_pet': ['safe', 'dog', 'cat', 'pet', 'eat', 'toxic', 'non-toxic', 'health', 'animal'],
@@ -26,17 +252,204 @@ class CompleteMatcher:
             'moisture': ['moisture', 'condensation', 'water', 'damp', 'stop', 'prevent', 'barrier'],
             'sound': ['sound', 'noise', 'acoustic', 'dampen', 'quiet', 'soundproof']
         }
+        self.context_automaton = KeywordAutomaton(self.context_keywords)
+        
+        # Query shorthand expanded before candidate lookup
+        self.query_synonyms = {
+            'pm2': ['price', 'cost', 'm2', 'square', 'metre', 'meter'],
+            'cost': ['price', 'quote', 'pricing'],
+            'price': ['cost', 'quote', 'pricing'],
+            'cable': ['wire', 'wiring', 'electrical'],
+            'rewire': ['wire', 'wiring', 'electrical', 'cable'],
+            'subfloor': ['underfloor', 'floor'],
+            'underfloor': ['subfloor', 'floor'],
+            'dog': ['pet', 'animal'],
+            'cat': ['pet', 'animal'],
+            'mould': ['mold', 'moisture', 'condensation'],
+            'noise': ['sound', 'acoustic'],
+            'rvalue': ['value', 'thermal', 'resistance']
+        }
+        
+        # Only score responses sharing a token with the (expanded) query; full scan when nothing matches
+        self.prune_candidates = True
+        
+        # Skip rows whose score upper bound cannot beat the current k-th best (results are unchanged)
+        self.prune_bounds = True
+        
+        # Optional BM25 first stage: only its top `rerank_depth` rows go through the fuzzy scorers
+        self.rerank_depth = 50
+        
+        # Precompute all dataset-side normalization once so queries only pay for query-side work;
+        # the result is snapshotted next to the dataset and reused while the dataset and rules are unchanged
+        self.index_snapshot_path = snapshot_path_for(dataset_path) if use_snapshot else None
+        self.load_or_build_index()
+        
+        # add_responses/remove_responses tombstone rows; compacted() drops them once they pass this share
+        self.compaction_ratio = 0.2
     
-    def get_query_context(self, query: str) -> List[str]:
-        """Identify query context categories"""
-        query_lower = query.lower()
-        contexts = []
+    def index_key(self) -> str:
+        """Snapshot key: dataset content hash plus everything else the index is derived from"""
+        rules = json.dumps([
+            INDEX_FORMAT_VERSION, NORMALIZER_VERSION, BM25_AVAILABLE,
+            sorted(STOP_WORDS), self.context_keywords
+        ], sort_keys=True)
+        return f"{self.dataset_version}:{hashlib.sha256(rules.encode()).hexdigest()}"
+    
+    def build_index(self):
+        """Normalize the whole corpus into a fresh ResponseIndex (and BM25 index when available)"""
+        with timed("build ResponseIndex"):
+            self.index = ResponseIndex(self.responses, self.get_query_context, self.context_automaton.group_names)
+        with timed("build BM25 index"):
+            self.bm25 = BM25Retriever(self.responses, tokenize) if BM25_AVAILABLE else None
+    
+    def load_or_build_index(self):
+        """Load the index snapshot when its key matches, otherwise rebuild and replace the snapshot"""
+        if self.index_snapshot_path is None:
+            self.build_index()
+            return
         
-        for context, keywords in self.context_keywords.items():
-            if any(keyword in query_lower for keyword in keywords):
-                contexts.append(context)
+        key = self.index_key()
+        with timed("load index snapshot"):
+            snapshot = load_snapshot(self.index_snapshot_path, key)
+        if snapshot is not None and len(snapshot['index']) == len(self.responses):
+            self.index, self.bm25 = snapshot['index'], snapshot['bm25']
+            self.index.get_context = self.get_query_context
+            return
         
-        return contexts
+        self.build_index()
+        with timed("save index snapshot"):
+            save_snapshot(self.index_snapshot_path, key, {'index': self.index, 'bm25': self.bm25})
+    
+    def fork(self) -> 'CompleteMatcher':
+        """Copy that can be updated while searches keep running on this matcher"""
+        matcher = copy.copy(self)
+        matcher.responses = self.responses.copy()
+        matcher.index = self.index.copy()
+        matcher.index.get_context = matcher.get_query_context
+        matcher.bm25 = self.bm25.copy() if self.bm25 is not None else None
+        return matcher
+    
+    def matches_source(self) -> bool:
+        """True while the rows are exactly those of the file at dataset_path when it was loaded"""
+        return self.dataset_version == self.source_version
+    
+    def _live_rows_by_key(self, key: str) -> Dict[Any, int]:
+        """Live row id for every key value"""
+        if key not in self.responses.columns:
+            return {}
+        return {self.responses.value(key, row_id): row_id for row_id in self.responses.live_ids()}
+    
+    def _data_changed(self):
+        """New cache version for the updated data (cached results for the old rows are dropped)"""
+        self.dataset_version = f"{self.dataset_version.split('+')[0]}+{next(_update_counter)}"
+    
+    def add_responses(self, records: List[Dict[str, Any]], key: str = 'original_index') -> List[int]:
+        """Append responses, replacing any live row with the same `key` value, without rebuilding the index
+        
+        Only the new rows are normalized and tokenized; the store grows once per batch, postings and
+        context masks are extended in place and replaced rows are tombstoned. Only call this (and
+        remove_responses) on a fork() that no other thread is searching, then swap the fork in.
+        """
+        items = flag_corrupted_records([dict(record) for record in records])
+        rows_by_key = self._live_rows_by_key(key)
+        replaced = []
+        for row_id, item in enumerate(items, start=len(self.responses)):
+            value = item.get(key)
+            if value is None:
+                continue
+            # A later record with the same key (even in this batch) replaces the earlier one
+            previous = rows_by_key.get(value)
+            if previous is not None:
+                replaced.append(previous)
+            rows_by_key[value] = row_id
+        
+        row_ids = self.responses.extend(items)
+        for row_id in row_ids:
+            self.index.add(self.responses[row_id])
+        for row_id in replaced:
+            self.responses.delete(row_id)
+            self.index.remove(row_id)
+        
+        if self.bm25 is not None and row_ids:
+            self.bm25.add_documents(self.responses[row_id] for row_id in row_ids)
+        self._data_changed()
+        return row_ids
+    
+    def remove_responses(self, keys: List[Any], key: str = 'original_index') -> int:
+        """Tombstone the live rows with these `key` values; returns how many were removed"""
+        rows_by_key = self._live_rows_by_key(key)
+        removed = 0
+        for value in keys:
+            row_id = rows_by_key.pop(value, None)
+            if row_id is not None:
+                self.responses.delete(row_id)
+                self.index.remove(row_id)
+                removed += 1
+        if removed:
+            self._data_changed()
+        return removed
+    
+    def needs_compaction(self) -> bool:
+        """True once tombstones make up more than `compaction_ratio` of the rows"""
+        return len(self.responses.deleted) > self.compaction_ratio * max(len(self.responses), 1)
+    
+    def compacted(self) -> 'CompleteMatcher':
+        """Copy without tombstoned rows; stored features are renumbered, not recomputed"""
+        keep_ids = self.responses.live_ids()
+        matcher = copy.copy(self)
+        matcher.responses = self.responses.take(keep_ids)
+        matcher.index = self.index.compacted(keep_ids)
+        matcher.index.get_context = matcher.get_query_context
+        # Tombstoned documents stop counting towards BM25 document frequencies here
+        matcher.bm25 = self.bm25.compacted(keep_ids) if self.bm25 is not None else None
+        return matcher
+    
+    def save(self, dataset_path: str) -> str:
+        """Write the live rows as the dataset (parquet, .arrow copy and index snapshot) so a restart or
+        hot reload loads the updated data without re-indexing"""
+        matcher = self.compacted() if self.responses.deleted else copy.copy(self)
+        temp_path = dataset_path + '.tmp'
+        matcher.responses.to_dataframe().to_parquet(temp_path, index=False)
+        os.replace(temp_path, dataset_path)
+        export_arrow(dataset_path)
+        
+        matcher.dataset_version = dataset_content_hash(dataset_path)
+        save_snapshot(snapshot_path_for(dataset_path), matcher.index_key(), {'index': matcher.index, 'bm25': matcher.bm25})
+        return dataset_path
+    
+    def expand_query_tokens(self, query: str) -> set:
+        """Query tokens plus synonyms and keywords of every matched context group"""
+        tokens = set(tokenize(query))
+        for token in list(tokens):
+            tokens.update(self.query_synonyms.get(token, []))
+        for context in self.get_query_context(query):
+            for keyword in self.context_keywords[context]:
+                tokens.update(tokenize(keyword))
+        return tokens
+    
+    def candidate_ids(self, query: str, count: int = 1, retriever: str = 'fuzzy') -> List[int]:
+        """Rows worth running the fuzzy cascade on, most promising first, falling back to every row"""
+        all_ids = self.index.live_ids()
+        if retriever == 'bm25' and self.bm25 is not None:
+            # Re-rank only the best BM25 rows; the fuzzy scores still decide the final order
+            ranked = self.bm25.top_k_tokens(
+                self.expand_query_tokens(query), max(self.rerank_depth, count) + len(self.index.excluded)
+            )
+            row_ids = [row_id for row_id, _ in ranked if row_id not in self.index.excluded][:max(self.rerank_depth, count)]
+        elif not self.prune_candidates:
+            return all_ids
+        else:
+            row_ids = self.index.candidates(self.expand_query_tokens(query))
+        
+        # Guaranteed full scan when pruning leaves too few rows to fill the result list
+        if len(row_ids) < count:
+            return all_ids
+        return row_ids
+    
+    def get_query_context(self, query: str) -> List[str]:
+        """Identify query context categories"""
+        # One Aho-Corasick pass finds every context group hit
+        return self.context_automaton.matched_groups(query.lower())
     
     def calculate_response_score(self, query: str, response_item: Dict[str, Any]) -> Tuple[float, Dict[str, Any]]:
         """Calculate detailed score for single response against query"""
@@ -44,92 +457,186 @@ class CompleteMatcher:
         original_query = response_item.get('original_query', '')
         category = response_item.get('category', '')
         
-        # Normalize for comparison
-        query_norm = query.lower().strip()
-        response_norm = response_text.lower()
-        orig_query_norm = original_query.lower()
-        category_norm = category.lower()
+        context_match = context_jaccard(
+            self.index.context_mask(self.get_query_context(query)),
+            self.index.context_mask(self.get_query_context(response_text + " " + original_query))
+        )
+        components = self._component_scores(
+            canonicalize_query(query),
+            response_text.lower(),
+            original_query.lower(),
+            category.lower(),
+            context_match
+        )
+        return self._weighted_score(components), self._scoring_details(components, response_item)
+    
+    def _indexed_components(self, query_norm: str, context_match: float, i: int,
+                            can_beat=None) -> Optional[Tuple[float, float, float, float]]:
+        """Component scores for indexed response i given its precomputed context score"""
+        index = self.index
+        return self._component_scores(
+            query_norm,
+            index.response_norm[i],
+            index.orig_query_norm[i],
+            index.category_norm[i],
+            context_match,
+            can_beat
+        )
+    
+    def _component_scores(self, query_norm: str, response_norm: str, orig_query_norm: str,
+                          category_norm: str, context_match: float,
+                          can_beat=None) -> Optional[Tuple[float, float, float, float]]:
+        """Multi-algorithm scores (query, content, category, context) over already-normalized fields
         
-        # Multi-algorithm scoring
-        scores = {}
+        can_beat(upper_bound) lets a top-k caller abandon the row (None is returned) as soon as
+        its best possible weighted score cannot make the cut. Fuzzy scores are capped at 100,
+        so the short-field scores bound the total before the long response is touched.
+        """
+        # 3. Category relevance (15% weight) - short field, scored first to tighten the bound
+        category_match = fuzz.partial_ratio(query_norm, category_norm)
+        if can_beat is not None and not can_beat(self._weighted_score((100, 100, category_match, context_match))):
+            return None
         
         # 1. Direct query similarity (40% weight)
         if orig_query_norm:
-            scores['query_match'] = max(
+            query_match = max(
                 fuzz.token_set_ratio(query_norm, orig_query_norm),
                 fuzz.partial_ratio(query_norm, orig_query_norm),
                 fuzz.ratio(query_norm, orig_query_norm)
             )
         else:
-            scores['query_match'] = 0
+            query_match = 0
+        
+        # Skip the expensive partial_ratio over the full response when even a perfect content score loses
+        if can_beat is not None and not can_beat(self._weighted_score((query_match, 100, category_match, context_match))):
+            return None
             
         # 2. Response content similarity (30% weight)  
-        scores['content_match'] = max(
+        content_match = max(
             fuzz.token_set_ratio(query_norm, response_norm),
             fuzz.partial_ratio(query_norm, response_norm)
         )
         
-        # 3. Category relevance (15% weight)
-        scores['category_match'] = fuzz.partial_ratio(query_norm, category_norm)
-        
-        # 4. Context semantic matching (15% weight)
-        query_contexts = self.get_query_context(query)
-        response_contexts = self.get_query_context(response_text + " " + original_query)
-        
-        if query_contexts and response_contexts:
-            context_overlap = len(set(query_contexts) & set(response_contexts))
-            context_union = len(set(query_contexts) | set(response_contexts))
-            scores['context_match'] = (context_overlap / context_union * 100) if context_union > 0 else 0
-        else:
-            scores['context_match'] = 0
-        
-        # Calculate weighted final score
-        final_score = (
-            scores['query_match'] * 0.40 +
-            scores['content_match'] * 0.30 +
-            scores['category_match'] * 0.15 +
-            scores['context_match'] * 0.15
+        # 4. Context semantic matching (15% weight) is precomputed from context bitmasks
+        return query_match, content_match, category_match, context_match
+    
+    @staticmethod
+    def _weighted_score(components: Tuple[float, float, float, float]) -> float:
+        """Calculate weighted final score from component scores"""
+        query_match, content_match, category_match, context_match = components
+        return (
+            query_match * 0.40 +
+            content_match * 0.30 +
+            category_match * 0.15 +
+            context_match * 0.15
         )
-        
-        scoring_details = {
-            'individual_scores': scores,
-            'final_score': final_score,
-            'response_length': len(response_text),
+    
+    def _scoring_details(self, components: Tuple[float, float, float, float], response_item: Dict[str, Any]) -> Dict[str, Any]:
+        """Debug breakdown of a score - only built for responses that are returned"""
+        query_match, content_match, category_match, context_match = components
+        return {
+            'individual_scores': {
+                'query_match': query_match,
+                'content_match': content_match,
+                'category_match': category_match,
+                'context_match': context_match
+            },
+            'final_score': self._weighted_score(components),
+            'response_length': len(response_item.get('response', '')),
             'original_index': response_item.get('original_index', ''),
             'source': response_item.get('source', '')
         }
+    
+    def find_top_matches(self, query: str, count: int = 3, retriever: str = 'fuzzy',
+                         row_ids: List[int] = None) -> List[Dict[str, Any]]:
+        """Score each candidate row (row_ids, or candidate_ids() when not given) once and keep the best `count` in a bounded heap"""
+        if not query or not query.strip() or count < 1:
+            return []
+        if row_ids is None:
+            row_ids = self.candidate_ids(query, count, retriever)
+        
+        # Query-side work happens once; dataset-side features come from the index
+        query_norm = canonicalize_query(query)
+        
+        # Context overlap for every row at once from the precomputed bitmasks
+        context_scores = self.index.context_scores(self.index.context_mask(self.get_query_context(query)))
         
-        return final_score, scoring_details
+        # Min-heap of the best `count` rows keyed (score, -row) so ties keep dataset order
+        top = []
+        
+        def can_beat(i: int, upper_bound: float) -> bool:
+            return len(top) < count or (upper_bound, -i) > top[0][:2]
+        
+        # Candidates arrive most promising first, so the k-th best score rises early and prunes more
+        for i in row_ids:
+            components = self._indexed_components(
+                query_norm, float(context_scores[i]), i, can_beat=partial(can_beat, i) if self.prune_bounds else None
+            )
+            if components is None:
+                continue
+            entry = (self._weighted_score(components), -i, components)
+            if len(top) < count:
+                heapq.heappush(top, entry)
+            elif entry[:2] > top[0][:2]:
+                heapq.heapreplace(top, entry)
+        
+        return [
+            self._build_match(score, -negative_row, components)
+            for score, negative_row, components in sorted(top, key=itemgetter(0, 1), reverse=True)
+        ]
     
-    def find_best_match_from_all(self, query: str) -> Dict[str, Any]:
-        """Evaluate ALL responses and return best match - never fails"""
+    def _build_match(self, score: float, i: int, components: Tuple[float, float, float, float]) -> Dict[str, Any]:
+        """Result dict for a returned match"""
+        response_item = self.responses[i]
+        return {
+            'score': score,
+            'response_text': response_item.get('response', ''),
+            'original_query': response_item.get('original_query', ''),
+            'category': response_item.get('category', ''),
+            'source': response_item.get('source', ''),
+            'original_index': response_item.get('original_index', ''),
+            'scoring_details': self._scoring_details(components, response_item),
+            'response_index': i
+        }
+    
+    def find_best_with_alternatives(self, query: str, count: int = 3,
+                                    retriever: str = 'fuzzy') -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """Single scoring pass returning the formatted best answer plus the raw top `count` matches"""
         if not query or not query.strip():
-            return self._get_generic_response()
+            return self._get_generic_response(), []
         
-        print(f"Evaluating ALL {len(self.responses)} responses for: '{query}'")
+        if retriever not in RETRIEVERS:
+            raise ValueError(f"Unknown retriever '{retriever}', expected one of {RETRIEVERS}")
         
-        # Score every single response
-        all_scores = []
-        for i, response_item in enumerate(self.responses):
-            score, details = self.calculate_response_score(query, response_item)
-            
-            result = {
-                'score': score,
-                'response_text': response_item.get('response', ''),
-                'original_query': response_item.get('original_query', ''),
-                'category': response_item.get('category', ''),
-                'source': response_item.get('source', ''),
-                'original_index': response_item.get('original_index', ''),
-                'scoring_details': details,
-                'response_index': i
-            }
-            all_scores.append(result)
+        cache_key = self._cache_key(query, count, retriever)
+        cached = self.cache.get(self.dataset_version, cache_key)
+        if cached is not None:
+            return cached
         
-        # Sort by score - best first
-        all_scores.sort(key=lambda x: x['score'], reverse=True)
+        row_ids = self.candidate_ids(query, max(count, 1), retriever)
+        print(f"Scoring {len(row_ids)} of {len(self.index.live_ids())} responses for: '{query}'")
         
-        best_match = all_scores[0]
+        top_matches = self.find_top_matches(query, max(count, 1), retriever, row_ids)
+        if not top_matches:
+            return self._get_generic_response(), []
         
+        result = (self._format_best_match(query, top_matches[0]), top_matches[:count])
+        self.cache.put(self.dataset_version, cache_key, result)
+        return result
+    
+    def _cache_key(self, query: str, count: int, retriever: str = 'fuzzy') -> Tuple[Any, ...]:
+        """Cache key for a search: canonical query, result count, first-stage retriever and the
+        pruning settings in effect (changing them on a live matcher must not serve old results)"""
+        return ('best_with_alternatives', canonicalize_query(query), count, retriever,
+                self.prune_candidates, self.prune_bounds, self.rerank_depth)
+    
+    def find_best_match_from_all(self, query: str) -> Dict[str, Any]:
+        """Evaluate ALL responses and return best match - never fails"""
+        best_result, _ = self.find_best_with_alternatives(query, 1)
+        return best_result
+    
+    def _format_best_match(self, query: str, best_match: Dict[str, Any]) -> Dict[str, Any]:
+        """Turn the top-scoring match into a UI result, adapting weaker matches"""
         print(f"Best match: Score {best_match['score']:.1f}% from {best_match['source']} ({best_match['original_index']})")
         
         # Always return best match, possibly with minimal adaptation
@@ -201,21 +708,16 @@ class CompleteMatcher:
     
     def get_multiple_matches(self, query: str, count: int = 3) -> List[Dict[str, Any]]:
         """Get top N matches for query"""
-        all_scores = []
-        
-        for response_item in self.responses:
-            score, details = self.calculate_response_score(query, response_item)
-            all_scores.append({
-                'score': score,
-                'response': response_item.get('response', ''),
-                'category': response_item.get('category', ''),
-                'source': response_item.get('source', ''),
-                'original_index': response_item.get('original_index', '')
-            })
-        
-        # Return top matches
-        all_scores.sort(key=lambda x: x['score'], reverse=True)
-        return all_scores[:count]
+        return [
+            {
+                'score': match['score'],
+                'response': match['response_text'],
+                'category': match['category'],
+                'source': match['source'],
+                'original_index': match['original_index']
+            }
+            for match in self.find_top_matches(query, count)
+        ]
 
 def test_complete_matcher():
     """Test with the 4 failing queries + 4 additional"""
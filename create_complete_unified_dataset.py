@@ -8,6 +8,10 @@ import json
 import re
 from typing import List, Dict, Any
 
+from arrow_dataset import export_arrow
+from dataset_cleaner import CORRUPTION_RULES_VERSION, add_corruption_columns
+from quality_scoring import QUALITY_RULES_VERSION, add_quality_columns
+
 def minimal_clean_response(text: str) -> str:
     """Minimal cleaning - only remove obvious corruption, preserve all content"""
     if not text or pd.isna(text):
@@ -113,10 +117,21 @@ def load_complete_unified_dataset():
     sources = df_unified['source'].value_counts()
     print(f"Sources: {dict(sources)}")
     
+    # Persist quality scores and per-category aggregates so the app never recomputes them
+    add_quality_columns(df_unified)
+    print(f"Quality scores computed with rules v{QUALITY_RULES_VERSION}: avg={df_unified['quality_score'].mean():.1f}")
+    
+    # Flag corrupted rows once so search never runs the corruption regexes per query
+    add_corruption_columns(df_unified)
+    print(f"Corruption flags computed with rules v{CORRUPTION_RULES_VERSION}: {int(df_unified['is_corrupted'].sum())} flagged")
+    
     # Save unified dataset
     df_unified.to_parquet('unified_responses.parquet', index=False)
     print(f"\nSaved unified_responses.parquet with {len(df_unified)} responses")
     
+    # Memory-mappable copy so app workers start without decoding the parquet
+    print(f"Saved {export_arrow('unified_responses.parquet')} for memory-mapped loading")
+    
     return df_unified
 
 def verify_dataset_completeness(df):
@@ -3,15 +3,44 @@
 Dataset cleaner for Yetifoam Response Generator
 Analyzes, cleans, validates, and rebuilds corrupted Parquet dataset
 """
+from __future__ import annotations
 
-import pandas as pd
 import re
 import json
 import sys
-from typing import List, Tuple, Dict, Any
+from typing import TYPE_CHECKING, List, Tuple, Dict, Any
+
+# pandas is only needed by the offline cleaning steps, not by the corruption checks the app imports
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Bump whenever CORRUPTION_PATTERNS change so stored is_corrupted flags get recomputed
+CORRUPTION_RULES_VERSION = 1
+
+# Columns written by add_corruption_columns
+CORRUPTION_COLUMNS = ['is_corrupted', 'corruption_rules_version']
+
+CORRUPTION_PATTERNS = {
+    'metadata_instructions': r'Make sure to include\s*``\s*markers|provide citations|Formatting instructions|format the response|include citations',
+    'call_transcripts': r'Customer:\s*\(Calling in\)|Hi, is this Ryan|Ryan:\s*|Customer Service|phone call',
+    'document_headers': r'\*\*Yetifoam Social Media Comment Responses\s*[–-]\s*Categorised\s*\(Updated\)\*\*|\*\*Category:\s*\w+\*\*',
+    'partial_urls_dates': r'https?://[^\s]*\s*(incomplete)|^\d{4}-\d{2}-\d{2}|Updated on \d+',
+    'truncated_sentences': 'SPECIAL_CHECK',  # Will be handled separately
+    'mixed_metadata': r'\[Metadata:\s*.*?\]|\{Document ID:\s*\w+\}|Document ID|Metadata'
+}
+CORRUPTION_REGEXES = {
+    pattern_name: re.compile(pattern, re.IGNORECASE | re.DOTALL)
+    for pattern_name, pattern in CORRUPTION_PATTERNS.items() if pattern != 'SPECIAL_CHECK'
+}
+
+# Text fields checked when flagging records (unified, clean and legacy structures)
+CORRUPTION_TEXT_FIELDS = ['response', 'original_query', 'question', 'standardized_response',
+                          'inferred_question', 'original_text', 'response_text']
 
 def load_dataset(file_path: str) -> pd.DataFrame:
     """Load the corrupted dataset and print initial stats"""
+    import pandas as pd
+    
     try:
         df = pd.read_parquet(file_path)
         print(f"✓ Dataset loaded successfully")
@@ -26,16 +55,11 @@ def load_dataset(file_path: str) -> pd.DataFrame:
 
 def analyze_corruption_patterns(df: pd.DataFrame) -> pd.DataFrame:
     """Analyze data for corruption patterns"""
+    import pandas as pd
+    
     print("\n=== ANALYZING CORRUPTION PATTERNS ===")
     
-    corruption_patterns = {
-        'metadata_instructions': r'Make sure to include\s*``\s*markers|provide citations|Formatting instructions|format the response|include citations',
-        'call_transcripts': r'Customer:\s*\(Calling in\)|Hi, is this Ryan|Ryan:\s*|Customer Service|phone call',
-        'document_headers': r'\*\*Yetifoam Social Media Comment Responses\s*[–-]\s*Categorised\s*\(Updated\)\*\*|\*\*Category:\s*\w+\*\*',
-        'partial_urls_dates': r'https?://[^\s]*\s*(incomplete)|^\d{4}-\d{2}-\d{2}|Updated on \d+',
-        'truncated_sentences': 'SPECIAL_CHECK',  # Will be handled separately
-        'mixed_metadata': r'\[Metadata:\s*.*?\]|\{Document ID:\s*\w+\}|Document ID|Metadata'
-    }
+    corruption_patterns = CORRUPTION_PATTERNS
     
     # Add corruption analysis columns
     df['is_corrupted'] = False
@@ -118,8 +142,39 @@ def analyze_corruption_patterns(df: pd.DataFrame) -> pd.DataFrame:
     
     return df
 
+def detect_corruption(text: str) -> List[str]:
+    """Names of the corruption patterns found in text (regex patterns only, no truncation check)"""
+    if not text:
+        return []
+    return [pattern_name for pattern_name, regex in CORRUPTION_REGEXES.items() if regex.search(text)]
+
+def flag_corrupted_records(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Add is_corrupted flags to dataset records in place"""
+    for item in records:
+        item['is_corrupted'] = any(
+            detect_corruption(str(item[field])) for field in CORRUPTION_TEXT_FIELDS if item.get(field)
+        )
+        item['corruption_rules_version'] = CORRUPTION_RULES_VERSION
+    return records
+
+def has_current_corruption_flags(records: List[Dict[str, Any]]) -> bool:
+    """True when every record carries flags from the current pattern version"""
+    return all(
+        item.get('corruption_rules_version') == CORRUPTION_RULES_VERSION and item.get('is_corrupted') is not None
+        for item in records
+    )
+
+def add_corruption_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """DataFrame version of flag_corrupted_records for the dataset build pipeline"""
+    records = flag_corrupted_records(df.to_dict('records'))
+    for column in CORRUPTION_COLUMNS:
+        df[column] = [item[column] for item in records]
+    return df
+
 def extract_qa_pairs(text: str) -> Tuple[str, str]:
     """Extract question and answer from text"""
+    import pandas as pd
+    
     if not text or pd.isna(text):
         return "", ""
     
@@ -153,6 +208,8 @@ def extract_qa_pairs(text: str) -> Tuple[str, str]:
 
 def clean_text(text: str) -> str:
     """Clean corruption from text"""
+    import pandas as pd
+    
     if not text or pd.isna(text):
         return ""
     
@@ -223,6 +280,8 @@ def infer_category(text: str) -> str:
 
 def clean_dataset(df: pd.DataFrame) -> pd.DataFrame:
     """Clean the dataset and extract valid Q&A pairs"""
+    import pandas as pd
+    
     print("\n=== CLEANING DATASET ===")
     
     # Determine text column
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Polling watcher for the unified dataset file
+Calls back from a background thread once a changed file has stopped changing, so a new
+engine can be built off the request path and swapped in when ready
+"""
+import os
+import threading
+from typing import Callable, Optional, Tuple
+
+def file_signature(path: str) -> Optional[Tuple[int, int]]:
+    """(mtime_ns, size) of a file, or None if it does not exist"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+class DatasetWatcher:
+    """mtime/size polling (no inotify dependency, works on network and container filesystems)"""
+
+    def __init__(self, path: str, on_change: Callable[[], None], interval: float = 5.0,
+                 loaded_signature: Optional[Tuple[int, int]] = None):
+        self.path = path
+        self.on_change = on_change
+        self.interval = interval
+        # Signature of the file the current engine was built from
+        self.loaded_signature = loaded_signature if loaded_signature is not None else file_signature(path)
+        self._pending = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def poll(self) -> bool:
+        """Check the file once; returns True if on_change was called"""
+        signature = file_signature(self.path)
+        if signature is None or signature == self.loaded_signature:
+            self._pending = None
+            return False
+        # Wait for two identical polls so a file that is still being written is not loaded half-way
+        if signature != self._pending:
+            self._pending = signature
+            return False
+        self._pending = None
+        self.loaded_signature = signature
+        self.on_change()
+        return True
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll()
+            except Exception as e:
+                # A failed reload keeps the current engine; the next change triggers another attempt
+                print(f"Dataset reload failed: {e}")
+
+    def start(self) -> 'DatasetWatcher':
+        """Start polling in a daemon thread (no-op if already running)"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='dataset-watcher', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop polling and wait for an in-progress check to finish"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -3,17 +3,18 @@
 Enhanced semantic matching engine for Yetifoam queries
 Uses multiple similarity algorithms and context understanding
 """
-import pandas as pd
 import re
 from typing import List, Dict, Tuple, Any
 from fuzzywuzzy import fuzz, process
 import math
 
+from arrow_dataset import load_response_store
+from keyword_automaton import KeywordAutomaton
+
 class SemanticMatcher:
     def __init__(self, dataset_path: str = 'unified_responses.parquet'):
         """Initialize with unified dataset"""
-        self.df = pd.read_parquet(dataset_path)
-        self.responses = self.df.to_dict('records')
+        self.responses = load_response_store(dataset_path)
         
         # Semantic keyword groups for context understanding
         self.semantic_groups = {
@@ -27,6 +28,7 @@ class SemanticMatcher:
             'pests': ['pest', 'rodent', 'rat', 'mouse', 'insect', 'bug', 'barrier'],
             'sound': ['sound', 'noise', 'acoustic', 'quiet', 'dampen', 'soundproof']
         }
+        self.semantic_automaton = KeywordAutomaton(self.semantic_groups)
     
     def normalize_query(self, query: str) -> str:
         """Normalize query for better matching"""
@@ -55,14 +57,8 @@ class SemanticMatcher:
     
     def get_semantic_context(self, query: str) -> List[str]:
         """Identify semantic context categories for the query"""
-        query_lower = query.lower()
-        contexts = []
-        
-        for context, keywords in self.semantic_groups.items():
-            if any(keyword in query_lower for keyword in keywords):
-                contexts.append(context)
-        
-        return contexts
+        # One Aho-Corasick pass finds every context group hit
+        return self.semantic_automaton.matched_groups(query.lower())
     
     def calculate_semantic_score(self, query: str, response_item: Dict[str, Any]) -> float:
         """Calculate semantic similarity score"""
@@ -123,10 +119,12 @@ class SemanticMatcher:
         for response_item in self.responses:
             score = self.calculate_semantic_score(query, response_item)
             if score >= min_score:
-                result = response_item.copy()
-                result['similarity_score'] = round(score, 1)
-                result['match_confidence'] = 'high' if score >= 85 else 'good'
-                scored_responses.append(result)
+                # Result references the stored row instead of copying it
+                scored_responses.append(self.responses.reference(
+                    response_item.row_id,
+                    similarity_score=round(score, 1),
+                    match_confidence='high' if score >= 85 else 'good'
+                ))
         
         # Sort by score and return top matches
         scored_responses.sort(key=lambda x: x['similarity_score'], reverse=True)
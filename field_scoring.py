@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Field-weighted fuzzy scoring for Yetifoam search (BM25F style)
+Each field is scored once and the scores are combined with the field weights,
+instead of repeating higher-weighted field text before matching
+"""
+from typing import Any, Callable, Dict, List, Tuple
+
+# Clean dataset structure - response, question, category
+CLEAN_FIELD_WEIGHTS = [
+    ('response', 0.60),              # Clean response - highest weight
+    ('question', 0.30),              # Question - medium weight
+    ('category', 0.10),              # Category - lowest weight
+]
+
+# Unified dataset structure - the clean weights with the question stored as original_query
+UNIFIED_FIELD_WEIGHTS = [
+    ('response', 0.60),              # Clean response - highest weight
+    ('original_query', 0.30),        # Question - medium weight
+    ('category', 0.10),              # Category - lowest weight
+]
+
+# Legacy dataset structure
+LEGACY_FIELD_WEIGHTS = [
+    ('standardized_response', 0.50),  # Primary response - highest weight
+    ('inferred_question', 0.30),      # Generated questions - medium weight
+    ('original_text', 0.20),          # Source text - lowest weight
+    ('response_text', 0.15),          # Alternative response - backup
+    ('category', 0.05)                # Category context - minimal weight
+]
+
+def field_weights_for(item: Dict[str, Any]) -> List[Tuple[str, float]]:
+    """Field weight table matching the item's dataset structure"""
+    if 'response' in item and 'question' in item:
+        return CLEAN_FIELD_WEIGHTS
+    if 'response' in item and 'original_query' in item:
+        return UNIFIED_FIELD_WEIGHTS
+    return LEGACY_FIELD_WEIGHTS
+
+def weighted_fields(item: Dict[str, Any], field_weights: List[Tuple[str, float]] = None) -> List[Tuple[str, float]]:
+    """(text, weight) for every non-empty searchable field, in priority order"""
+    fields = []
+    for field, weight in field_weights or field_weights_for(item):
+        if field in item and item[field]:
+            text = str(item[field]).strip()
+            if text:
+                fields.append((text, weight))
+    return fields
+
+def field_weighted_score(query: str, fields: List[Tuple[str, float]], scorer: Callable[[str, str], float]) -> float:
+    """Weighted mean of scorer(query, field_text) with every field scored exactly once"""
+    if len(fields) == 1:
+        return scorer(query, fields[0][0])
+    total_weight = sum(weight for _, weight in fields)
+    if not total_weight:
+        return 0.0
+    return sum(scorer(query, text) * weight for text, weight in fields) / total_weight
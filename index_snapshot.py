@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Search index snapshots stored next to the dataset
+The matcher's precomputed index is saved once and reloaded on later starts while its key
+(dataset content hash plus the versions of the rules that built it) still matches
+"""
+import os
+import pickle
+import tempfile
+from typing import Any, Optional
+
+def snapshot_path_for(dataset_path: str) -> str:
+    """Path of the index snapshot that sits next to a parquet dataset"""
+    return os.path.splitext(dataset_path)[0] + '.index.pkl'
+
+def load_snapshot(snapshot_path: str, key: str) -> Optional[Any]:
+    """Snapshot payload if the file exists and was written for this key, otherwise None"""
+    if not os.path.exists(snapshot_path):
+        return None
+    try:
+        with open(snapshot_path, 'rb') as f:
+            # The key is stored ahead of the payload so a stale snapshot is rejected without loading it
+            if pickle.load(f) != key:
+                return None
+            return pickle.load(f)
+    except Exception as e:  # truncated/foreign files raise assorted unpickling errors
+        print(f"Ignoring unreadable index snapshot {snapshot_path}: {e}")
+        return None
+
+def save_snapshot(snapshot_path: str, key: str, payload: Any) -> bool:
+    """Write a snapshot atomically (readers see the old file or the new one, never a partial write)"""
+    directory = os.path.dirname(os.path.abspath(snapshot_path))
+    try:
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.index-', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(key, f, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+            # mkstemp files are owner-only; other worker users read the snapshot like the dataset
+            os.chmod(temp_path, 0o644)
+            os.replace(temp_path, snapshot_path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+    except OSError as e:
+        # A read-only deployment still works, it just rebuilds the index on every start
+        print(f"Could not write index snapshot {snapshot_path}: {e}")
+        return False
+    return True
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Aho-Corasick multi-keyword matcher
+Finds every keyword-group hit in a single pass over the text instead of one substring scan per keyword
+"""
+from collections import deque
+from typing import Dict, Iterable, List, Set
+
+class KeywordAutomaton:
+    """Substring matcher over named keyword groups (same semantics as `keyword in text`)"""
+
+    def __init__(self, keyword_groups: Dict[str, Iterable[str]]):
+        self.group_names = list(keyword_groups)
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+
+        # Trie of every keyword; matching is case-sensitive, callers lowercase the text as before
+        for group_position, group in enumerate(self.group_names):
+            for keyword in keyword_groups[group]:
+                if not keyword:
+                    continue
+                state = 0
+                for char in keyword:
+                    next_state = self._goto[state].get(char)
+                    if next_state is None:
+                        next_state = len(self._goto)
+                        self._goto[state][char] = next_state
+                        self._goto.append({})
+                        self._fail.append(0)
+                        self._output.append([])
+                    state = next_state
+                self._output[state].append((group_position, keyword))
+
+        # Breadth-first failure links; each state inherits the outputs of its failure state
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def search(self, text: str) -> Dict[str, Set[str]]:
+        """Matched keywords per group (groups without hits are omitted)"""
+        hits = {}
+        if not text:
+            return hits
+
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for group_position, keyword in output[state]:
+                hits.setdefault(self.group_names[group_position], set()).add(keyword)
+        return hits
+
+    def matched_groups(self, text: str) -> List[str]:
+        """Names of groups with at least one keyword in text, in declaration order"""
+        hits = self.search(text)
+        return [group for group in self.group_names if group in hits]
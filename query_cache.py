@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Bounded LRU/TTL cache for search results
+Entries are keyed by dataset version so a changed parquet never serves stale matches, while
+sessions still on the previous version keep their own entries until they age out
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+def canonicalize_query(query: str) -> str:
+    """Case- and whitespace-insensitive form of a query used for scoring and cache keys"""
+    return ' '.join(query.lower().split()) if query else ""
+
+class QueryCache:
+    """Thread-safe LRU cache with per-entry expiry and hit/miss counters
+
+    Values are deep-copied on the way in and out, so callers may modify what they get back.
+    """
+
+    def __init__(self, max_entries: int = 512, ttl_seconds: float = 3600):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, dataset_version: str, key: Hashable) -> Optional[Any]:
+        """Copy of the value cached for key under dataset_version, or None on a miss"""
+        entry_key = (dataset_version, key)
+        with self._lock:
+            entry = self._entries.get(entry_key)
+            if entry is not None:
+                stored_at, value = entry
+                if time.monotonic() - stored_at <= self.ttl_seconds:
+                    self._entries.move_to_end(entry_key)
+                    self.hits += 1
+                    return copy.deepcopy(value)
+                del self._entries[entry_key]
+            self.misses += 1
+            return None
+
+    def put(self, dataset_version: str, key: Hashable, value: Any):
+        """Store a copy of value, evicting the least recently used entry when full"""
+        if self.max_entries < 1:
+            return
+        entry_key = (dataset_version, key)
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._entries[entry_key] = (time.monotonic(), value)
+            self._entries.move_to_end(entry_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Remove all entries (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for monitoring"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits / lookups * 100) if lookups else 0.0,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'dataset_versions': len({dataset_version for dataset_version, _ in self._entries})
+            }
+
+# Process-wide cache shared by every matcher and session
+search_cache = QueryCache()
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Columnar response store shared by the matchers and the app
+One NumPy (or mapped Arrow) array per column instead of a dict per row; category/source are dictionary-encoded
+and rows are addressed by integer id through lightweight views
+"""
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterator, List
+
+import numpy as np
+
+# Low-cardinality text columns stored as integer codes into a table of distinct values
+DICTIONARY_COLUMNS = ('category', 'source')
+
+# Columns carried by result dicts that reference a row (values are shared, not copied)
+REFERENCE_COLUMNS = ('response', 'original_query', 'category', 'source', 'original_index', 'quality_score')
+
+def _fit_column(column: np.ndarray, value) -> np.ndarray:
+    """Column widened (int -> float -> object) if needed so value can be stored without loss"""
+    if column.dtype.kind not in 'biuf':
+        return column
+    if not isinstance(value, (bool, int, float, np.number, np.bool_)):
+        return column.astype(object)
+    dtype = np.result_type(column.dtype, np.asarray(value).dtype)
+    return column if dtype == column.dtype else column.astype(dtype)
+
+def _arrow_numpy(array) -> np.ndarray:
+    """NumPy array for an Arrow numeric array - a read-only view of its buffer when null-free
+    (read directly: pyarrow's to_numpy pulls in pandas)"""
+    import pyarrow as pa
+
+    kind = 'i' if pa.types.is_signed_integer(array.type) else 'u' if pa.types.is_integer(array.type) else 'f'
+    if array.null_count or pa.types.is_boolean(array.type):
+        return np.array(array.to_pylist())
+    dtype = np.dtype(f'{kind}{array.type.bit_width // 8}')
+    return np.frombuffer(array.buffers()[1], dtype=dtype, count=len(array), offset=array.offset * dtype.itemsize)
+
+class DictionaryColumn:
+    """Integer codes plus the distinct values they point to"""
+
+    def __init__(self, values=()):
+        self.values = []
+        self._lookup = {}
+        self.codes = np.array([self.encode(value) for value in values], dtype=np.int32)
+
+    def encode(self, value) -> int:
+        """Code for value, adding it to the value table if new"""
+        code = self._lookup.get(value)
+        if code is None:
+            code = self._lookup[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, row_id: int):
+        return self.values[self.codes[row_id]]
+
+    def __setitem__(self, row_id: int, value):
+        self.codes[row_id] = self.encode(value)
+
+    @classmethod
+    def from_codes(cls, codes: np.ndarray, values: List[Any]) -> 'DictionaryColumn':
+        """Wrap existing codes (e.g. mapped Arrow dictionary indices) without re-encoding"""
+        column = cls()
+        for value in values:
+            column.encode(value)
+        column.codes = codes
+        return column
+
+    def extend(self, values):
+        self.codes = np.concatenate([self.codes, np.array([self.encode(value) for value in values], dtype=np.int32)])
+
+    def tolist(self) -> List[Any]:
+        return [self.values[code] for code in self.codes]
+
+    def take(self, row_ids: np.ndarray) -> 'DictionaryColumn':
+        return DictionaryColumn.from_codes(self.codes[row_ids], list(self.values))
+
+    def copy(self) -> 'DictionaryColumn':
+        # Read-only (mapped) codes are shared; they are copied on first write anyway
+        codes = self.codes.copy() if self.codes.flags.writeable else self.codes
+        return DictionaryColumn.from_codes(codes, list(self.values))
+
+class ArrowColumn:
+    """Read-only Arrow array (e.g. memory-mapped text); cells are decoded only when read"""
+
+    def __init__(self, array):
+        self.array = array
+
+    def __len__(self) -> int:
+        return len(self.array)
+
+    def __getitem__(self, row_id: int):
+        return self.array[row_id].as_py()
+
+    def tolist(self) -> List[Any]:
+        return self.array.to_pylist()
+
+    def take(self, row_ids: np.ndarray) -> 'ArrowColumn':
+        return ArrowColumn(self.array.take(row_ids))
+
+    def to_numpy(self) -> np.ndarray:
+        """Decoded object array (taken on the first write to the column)"""
+        column = np.empty(len(self.array), dtype=object)
+        column[:] = self.array.to_pylist()
+        return column
+
+class ResponseRow(MutableMapping):
+    """Dict-like view of one stored row; reads and writes go straight to the columns"""
+    __slots__ = ('store', 'row_id')
+
+    def __init__(self, store: 'ResponseStore', row_id: int):
+        self.store = store
+        self.row_id = row_id
+
+    def __getitem__(self, column: str):
+        return self.store.value(column, self.row_id)
+
+    def __setitem__(self, column: str, value):
+        self.store.set_value(column, self.row_id, value)
+
+    def __delitem__(self, column: str):
+        raise TypeError("Columns cannot be removed from a single row")
+
+    def __contains__(self, column) -> bool:
+        return column in self.store.columns
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.store.columns)
+
+    def __len__(self) -> int:
+        return len(self.store.columns)
+
+    def copy(self) -> Dict[str, Any]:
+        """Materialize the row as a plain dict"""
+        return dict(self)
+
+    def __repr__(self) -> str:
+        return f"ResponseRow({self.row_id}, {self.copy()!r})"
+
+class ResponseStore:
+    """Response dataset held column by column"""
+
+    def __init__(self, columns: Dict[str, Any], length: int):
+        self.columns = columns
+        self._length = length
+        # Tombstoned row ids keep their slot (ids stay stable) until the store is compacted
+        self.deleted = set()
+        # Bumped on every append/delete so derived caches know when to rebuild
+        self.revision = 0
+
+    @classmethod
+    def from_dataframe(cls, df) -> 'ResponseStore':
+        """Build from a pandas DataFrame (numeric/bool columns keep their dtype, text becomes object arrays)"""
+        columns = {}
+        for name in df.columns:
+            series = df[name]
+            if name in DICTIONARY_COLUMNS:
+                columns[name] = DictionaryColumn(series.tolist())
+            elif series.dtype.kind in 'biuf':
+                columns[name] = series.to_numpy(copy=True)
+            else:
+                columns[name] = series.to_numpy(dtype=object)
+        return cls(columns, len(df))
+
+    @classmethod
+    def from_records(cls, records: List[Dict[str, Any]]) -> 'ResponseStore':
+        """Build from a list of dicts (e.g. a JSON dataset)"""
+        names = []
+        for record in records:
+            names.extend(name for name in record if name not in names)
+        columns = {}
+        for name in names:
+            values = [record.get(name) for record in records]
+            if name in DICTIONARY_COLUMNS:
+                columns[name] = DictionaryColumn(values)
+            else:
+                column = np.empty(len(values), dtype=object)
+                column[:] = values
+                columns[name] = column
+        return cls(columns, len(records))
+
+    @classmethod
+    def from_arrow(cls, table) -> 'ResponseStore':
+        """Build from a pyarrow Table, keeping its buffers (numeric arrays and dictionary codes are zero-copy views)"""
+        import pyarrow as pa
+
+        columns = {}
+        for name in table.column_names:
+            chunks = table.column(name)
+            array = chunks.chunk(0) if chunks.num_chunks == 1 else chunks.combine_chunks()
+            if name in DICTIONARY_COLUMNS:
+                if pa.types.is_dictionary(array.type) and not array.null_count:
+                    columns[name] = DictionaryColumn.from_codes(_arrow_numpy(array.indices), array.dictionary.to_pylist())
+                else:
+                    columns[name] = DictionaryColumn(array.to_pylist())
+            elif pa.types.is_integer(array.type) or pa.types.is_floating(array.type) or pa.types.is_boolean(array.type):
+                columns[name] = _arrow_numpy(array)
+            else:
+                columns[name] = ArrowColumn(array)
+        return cls(columns, table.num_rows)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, row_id: int) -> ResponseRow:
+        if not 0 <= row_id < self._length:
+            raise IndexError(f"Row {row_id} out of range")
+        return ResponseRow(self, row_id)
+
+    def __iter__(self) -> Iterator[ResponseRow]:
+        for row_id in range(self._length):
+            yield ResponseRow(self, row_id)
+
+    def value(self, column: str, row_id: int):
+        """Python value of one cell (KeyError for unknown columns, like a record dict)"""
+        value = self.columns[column][row_id]
+        return value.item() if isinstance(value, np.generic) else value
+
+    def _new_column(self, column: str):
+        """Empty column covering the existing rows"""
+        if column in DICTIONARY_COLUMNS:
+            return DictionaryColumn([None] * self._length)
+        return np.full(self._length, None, dtype=object)
+
+    def _writable(self, column: str):
+        """Column ready for in-place writes - mapped or read-only columns are copied on first write"""
+        target = self.columns[column]
+        if isinstance(target, ArrowColumn):
+            target = target.to_numpy()
+        elif isinstance(target, DictionaryColumn):
+            if not target.codes.flags.writeable:
+                target.codes = target.codes.copy()
+        elif not target.flags.writeable:
+            target = target.copy()
+        self.columns[column] = target
+        return target
+
+    def set_value(self, column: str, row_id: int, value):
+        """Write one cell, adding the column (empty elsewhere) if it does not exist yet"""
+        if column not in self.columns:
+            self.columns[column] = self._new_column(column)
+        target = self._writable(column)
+        if isinstance(target, np.ndarray):
+            # Numeric columns stay numeric unless the value does not fit
+            target = self.columns[column] = _fit_column(target, value)
+        target[row_id] = value
+
+    def append(self, record: Dict[str, Any]) -> int:
+        """Add one row (columns it lacks are left empty) and return its row id"""
+        return self.extend([record])[0]
+
+    def extend(self, records: List[Dict[str, Any]]) -> List[int]:
+        """Add rows (columns a row lacks are left empty) and return their row ids
+
+        Each column is grown with a single concatenation, so adding a batch costs one copy of the
+        store rather than one per row.
+        """
+        records = list(records)
+        if not records:
+            return []
+        for record in records:
+            for name in record:
+                if name not in self.columns:
+                    self.columns[name] = self._new_column(name)
+        for name in list(self.columns):
+            column = self._writable(name)
+            values = [record.get(name) for record in records]
+            if isinstance(column, DictionaryColumn):
+                column.extend(values)
+                continue
+            for value in values:
+                column = _fit_column(column, value)
+            cells = np.empty(len(values), dtype=column.dtype)
+            for position, value in enumerate(values):
+                cells[position] = value
+            self.columns[name] = np.concatenate([column, cells])
+        start = self._length
+        self._length += len(records)
+        self.revision += 1
+        return list(range(start, self._length))
+
+    def delete(self, row_id: int):
+        """Tombstone a row: it keeps its id and data but is no longer live"""
+        if not 0 <= row_id < self._length:
+            raise IndexError(f"Row {row_id} out of range")
+        self.deleted.add(row_id)
+        self.revision += 1
+
+    def live_ids(self) -> List[int]:
+        """Ids of rows that are not tombstoned, in row order"""
+        return [row_id for row_id in range(self._length) if row_id not in self.deleted]
+
+    def live_rows(self) -> Iterator[ResponseRow]:
+        for row_id in self.live_ids():
+            yield ResponseRow(self, row_id)
+
+    def take(self, row_ids: List[int]) -> 'ResponseStore':
+        """New store holding only the given rows, renumbered from 0 in the given order"""
+        positions = np.asarray(row_ids, dtype=np.int64)
+        columns = {name: column.take(positions) if not isinstance(column, np.ndarray) else column[positions]
+                   for name, column in self.columns.items()}
+        return ResponseStore(columns, len(positions))
+
+    def compacted(self) -> 'ResponseStore':
+        """Store without its tombstoned rows"""
+        return self.take(self.live_ids())
+
+    def copy(self) -> 'ResponseStore':
+        """Independent store for copy-on-write updates (read-only and Arrow buffers are shared)"""
+        columns = {}
+        for name, column in self.columns.items():
+            if isinstance(column, np.ndarray):
+                columns[name] = column.copy() if column.flags.writeable else column
+            else:
+                columns[name] = column.copy() if isinstance(column, DictionaryColumn) else column
+        store = ResponseStore(columns, self._length)
+        store.deleted = set(self.deleted)
+        store.revision = self.revision
+        return store
+
+    def column_values(self, column: str) -> List[Any]:
+        """Whole column as a list of Python values"""
+        return [self.value(column, row_id) for row_id in range(self._length)]
+
+    def reference(self, row_id: int, **fields) -> Dict[str, Any]:
+        """Small result dict pointing at a row: its id, the display columns and any extra fields"""
+        result = {'row_id': row_id}
+        for column in REFERENCE_COLUMNS:
+            if column in self.columns:
+                result[column] = self.value(column, row_id)
+        result.update(fields)
+        return result
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Plain list-of-dicts copy (for exports and legacy code)"""
+        return [row.copy() for row in self]
+
+    def to_dataframe(self):
+        """pandas DataFrame copy of the store"""
+        import pandas as pd
+
+        return pd.DataFrame({name: self.column_values(name) for name in self.columns})
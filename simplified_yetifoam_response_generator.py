@@ -11,6 +11,8 @@ from fuzzywuzzy import fuzz, process
 from typing import List, Dict
 import re
 
+from arrow_dataset import load_dataframe
+
 # Configure page
 st.set_page_config(
     page_title="YetiFoam Response Generator - Simple",
@@ -30,7 +32,8 @@ class SimpleResponseGenerator:
             # Try to load the updated parquet file first
             dataset_path = "updated_final_unified_responses.parquet"
             if os.path.exists(dataset_path):
-                self.dataset = pd.read_parquet(dataset_path)
+                # Memory-mapped from the exported .arrow copy when it is current
+                self.dataset = load_dataframe(dataset_path)
             else:
                 # Fallback to CSV if parquet doesn't exist
                 dataset_path = "updated_final_yetifoam_responses.csv"
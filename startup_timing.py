@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Startup timing report for the Streamlit entry point
+Set YETIFOAM_STARTUP_TIMING=1 to print how long each import group and init phase took
+"""
+import os
+import sys
+import time
+from contextlib import contextmanager
+from typing import List
+
+STARTUP_TIMING_ENV = 'YETIFOAM_STARTUP_TIMING'
+ENABLED = os.environ.get(STARTUP_TIMING_ENV, '').strip().lower() in ('1', 'true', 'yes', 'on')
+
+_process_start = time.perf_counter()
+# [phase, seconds, nesting depth] in start order, so nested phases print under their parent
+_timings: List[list] = []
+_depth = 0
+_reported = False
+
+@contextmanager
+def timed(phase: str):
+    """Record the duration of a startup phase (no-op unless enabled, and after the first report)"""
+    global _depth
+    if not ENABLED or _reported:
+        yield
+        return
+    entry = [phase, 0.0, _depth]
+    _timings.append(entry)
+    _depth += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        entry[1] = time.perf_counter() - start
+        _depth -= 1
+
+def report(stream=None):
+    """Print the recorded phases once; later reruns of the Streamlit script record nothing"""
+    global _reported
+    if not ENABLED or _reported:
+        return
+    _reported = True
+    stream = stream or sys.stderr
+    print("Startup timing:", file=stream)
+    for phase, seconds, depth in _timings:
+        print(f"  {seconds * 1000:9.1f} ms  {'  ' * depth}{phase}", file=stream)
+    print(f"  {(time.perf_counter() - _process_start) * 1000:9.1f} ms  total since first import", file=stream)
+    _timings.clear()
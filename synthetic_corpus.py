@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Seeded synthetic corpora and query workloads in the unified response schema
+Response sentences, question topics, category mix and length distribution are drawn from the
+real unified dataset plus the quality keywords, so matchers and pipeline scripts can be load
+tested at any size; the same seed always produces the same corpus and queries
+"""
+import argparse
+import json
+import random
+import re
+from collections import Counter, defaultdict
+from typing import Any, Dict, List
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from arrow_dataset import export_arrow
+from dataset_cleaner import detect_corruption
+from quality_scoring import QUALITY_KEYWORDS
+
+SYNTHETIC_SOURCE = 'synthetic'
+
+# Extra sentences built from the quality keywords so generated rows also hit the scoring vocabulary
+KEYWORD_SENTENCES = [
+    "Yetifoam delivers {keyword} as part of a single spray application.",
+    "Our installers can talk you through {keyword} during the site visit.",
+    "{Keyword} is one of the most common questions we get from homeowners.",
+    "For {keyword}, we recommend a professional assessment before installation.",
+]
+
+QUESTION_TEMPLATES = [
+    "{topic}?",
+    "Does Yetifoam help with {topic}?",
+    "What about {topic}?",
+    "Can you tell me about {topic}?",
+    "How does spray foam handle {topic}?",
+    "Is {topic} covered by the installation?",
+]
+
+# Word and phrase swaps used for paraphrase variants (both directions apply)
+PARAPHRASES = {
+    'price': 'cost', 'quote': 'estimate', 'safe': 'harmless', 'install': 'apply', 'house': 'home',
+    'dog': 'pet', 'wiring': 'cables', 'subfloor': 'underfloor', 'mould': 'mold', 'noise': 'sound',
+    'insulation': 'insulating foam', 'moisture': 'damp', 'roof': 'ceiling', 'fire': 'flame',
+    'does yetifoam help with': 'will spray foam fix', 'can you tell me about': 'i want to know about',
+    'what about': 'any info on', 'how does spray foam handle': 'how well does it deal with',
+}
+PARAPHRASE_PATTERNS = [
+    (re.compile(rf'\b{re.escape(source)}\b', re.IGNORECASE), target)
+    for pair in PARAPHRASES.items() for source, target in (pair, pair[::-1])
+]
+
+SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+')
+QUESTION_START = re.compile(r'(what|how|does|do|is|are|can|will|why|should|tell me)\b', re.IGNORECASE)
+# Question topics are plain text; headings with emoji or markup are left out
+PLAIN_TOPIC = re.compile(r"^[\w\s\-'/,&().]+$", re.ASCII)
+
+class CorpusProfile:
+    """What the generator samples from: per-category sentences and lengths from the real dataset"""
+
+    def __init__(self, dataset_path: str = 'unified_responses.parquet'):
+        table = pq.read_table(dataset_path)
+        self.schema = table.schema
+        records = [record for record in table.to_pylist()
+                   if not detect_corruption(str(record.get('response') or ''))]
+
+        self.category_weights = Counter(record.get('category') or 'General' for record in records)
+        self.sentences = defaultdict(list)
+        self.word_counts = defaultdict(list)
+        topics = set()
+        for record in records:
+            category = record.get('category') or 'General'
+            response = ' '.join(str(record.get('response') or '').split())
+            self.sentences[category].extend(sentence for sentence in SENTENCE_SPLIT.split(response) if len(sentence.split()) >= 4)
+            self.word_counts[category].append(len(response.split()))
+            query = str(record.get('original_query') or '').strip().rstrip('?')
+            if query and len(query.split()) <= 10 and PLAIN_TOPIC.match(query) and not detect_corruption(query):
+                topics.add(query)
+
+        # Real question topics plus every quality keyword phrase
+        self.keywords = sorted({keyword for group in QUALITY_KEYWORDS.values() for keyword in group})
+        self.topics = sorted(topics) + self.keywords
+        self.categories = sorted(self.category_weights)
+
+    def sample_response(self, rng: random.Random, category: str) -> str:
+        """Response text with a word count drawn from the category's real lengths (+/-25%)"""
+        target = max(8, int(rng.choice(self.word_counts[category]) * rng.uniform(0.75, 1.25)))
+        pool = self.sentences[category] or [sentence for sentences in self.sentences.values() for sentence in sentences]
+        sentences = []
+        words = 0
+        while words < target:
+            if rng.random() < 0.2:
+                keyword = rng.choice(self.keywords)
+                sentence = rng.choice(KEYWORD_SENTENCES).format(keyword=keyword, Keyword=keyword[:1].upper() + keyword[1:])
+            else:
+                sentence = rng.choice(pool)
+            sentences.append(sentence)
+            words += len(sentence.split())
+        return ' '.join(sentences)
+
+    def sample_question(self, rng: random.Random) -> str:
+        topic = rng.choice(self.topics)
+        # Real questions are kept as asked; headings and keywords are wrapped in a question template
+        if QUESTION_START.match(topic):
+            return topic + '?'
+        template = rng.choice(QUESTION_TEMPLATES)
+        if template != "{topic}?" and not topic[:2].isupper():
+            topic = topic[:1].lower() + topic[1:]
+        return template.format(topic=topic)
+
+def generate_corpus(size: int, seed: int = 0, profile: CorpusProfile = None,
+                    start_index: int = 0) -> List[Dict[str, Any]]:
+    """`size` synthetic records with the unified dataset's columns (original_index synthetic_<n>)"""
+    profile = profile or CorpusProfile()
+    rng = random.Random(seed)
+    weights = [profile.category_weights[category] for category in profile.categories]
+    records = []
+    for number in range(start_index, start_index + size):
+        category = rng.choices(profile.categories, weights)[0]
+        records.append({
+            'original_query': profile.sample_question(rng),
+            'response': profile.sample_response(rng, category),
+            'category': category,
+            'source': SYNTHETIC_SOURCE,
+            'original_index': f"{SYNTHETIC_SOURCE}_{number}"
+        })
+    return records
+
+def add_typo(text: str, rng: random.Random) -> str:
+    """One keyboard-style slip: swapped, dropped, doubled or replaced letter"""
+    positions = [i for i, char in enumerate(text) if char.isalpha()]
+    if len(positions) < 2:
+        return text
+    i = rng.choice(positions[:-1])
+    operation = rng.randrange(4)
+    if operation == 0:
+        return text[:i] + text[i + 1] + text[i] + text[i + 2:]
+    if operation == 1:
+        return text[:i] + text[i + 1:]
+    if operation == 2:
+        return text[:i] + text[i] + text[i:]
+    return text[:i] + rng.choice('abcdefghijklmnopqrstuvwxyz') + text[i + 1:]
+
+def paraphrase(text: str, rng: random.Random) -> str:
+    """Swap known words/phrases for near-synonyms; lowercases and drops the question mark when nothing matches"""
+    matching = [(pattern, target) for pattern, target in PARAPHRASE_PATTERNS if pattern.search(text)]
+    if not matching:
+        return text.lower().rstrip('?')
+    for pattern, target in rng.sample(matching, min(len(matching), 2)):
+        text = pattern.sub(target, text, count=1)
+    return text
+
+def generate_queries(corpus: List[Dict[str, Any]], count: int, seed: int = 0,
+                     typo_rate: float = 0.3, paraphrase_rate: float = 0.3) -> List[Dict[str, Any]]:
+    """Query workload against a corpus: each entry has the query, its variant and the row it came from
+
+    Variants are 'exact' (the stored question), 'typo', 'paraphrase' or 'typo+paraphrase'. Generated
+    questions repeat across rows, so target_index is the source row rather than the only right answer.
+    """
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(count):
+        record = rng.choice(corpus)
+        query = str(record.get('original_query') or '')
+        variant = []
+        if rng.random() < paraphrase_rate:
+            query = paraphrase(query, rng)
+            variant.append('paraphrase')
+        if rng.random() < typo_rate:
+            query = add_typo(query, rng)
+            variant.append('typo')
+        queries.append({
+            'query': query,
+            'variant': '+'.join(reversed(variant)) or 'exact',
+            'target_index': record.get('original_index')
+        })
+    return queries
+
+def write_corpus(path: str, records: List[Dict[str, Any]], schema: pa.Schema = None, arrow: bool = True) -> str:
+    """Write records as parquet (in the source dataset's schema when given) plus its .arrow copy"""
+    if schema is not None:
+        # Keep the column order/types but not pandas metadata describing the original file
+        schema = pa.schema(list(schema))
+    pq.write_table(pa.Table.from_pylist(records, schema=schema), path)
+    if arrow:
+        export_arrow(path)
+    return path
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic response corpus and query workload")
+    parser.add_argument('size', type=int, help="number of responses")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--dataset', default='unified_responses.parquet', help="real dataset to profile")
+    parser.add_argument('--output', default=None, help="parquet path (default: synthetic_<size>.parquet)")
+    parser.add_argument('--queries', type=int, default=0, help="also write this many queries as <output>.queries.json")
+    args = parser.parse_args()
+
+    profile = CorpusProfile(args.dataset)
+    records = generate_corpus(args.size, args.seed, profile)
+    output = args.output or f"synthetic_{args.size}.parquet"
+    write_corpus(output, records, profile.schema)
+    print(f"Wrote {len(records)} synthetic responses to {output}")
+
+    if args.queries:
+        queries_path = output.rsplit('.', 1)[0] + '.queries.json'
+        with open(queries_path, 'w', encoding='utf-8') as file:
+            json.dump(generate_queries(records, args.queries, args.seed), file, indent=2)
+        print(f"Wrote {args.queries} queries to {queries_path}")
+
+if __name__ == "__main__":
+    main()
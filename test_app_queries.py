@@ -4,12 +4,31 @@ Test the repaired Yetifoam app with challenging queries
 """
 import sys
 import os
+import tempfile
 
 # Add current directory to path
 sys.path.append(os.path.dirname(__file__))
 
+from synthetic_corpus import generate_corpus, generate_queries, write_corpus
 from yetifoam_enhanced_final_streamlit_app import YetifoamEnhancedResponseGenerator
 
+# Test queries (4 failing + 6 additional)
+CHALLENGING_QUERIES = [
+    # Original failing queries
+    "what about cables in the subfloor?",
+    "IS IT SAFE FOR DOGS INCASE THEY EAT IT?",
+    "It would be a nightmare to rewire under there",  
+    "how much pm2",
+    
+    # Additional challenging queries
+    "R-value per inch",
+    "installation cost",
+    "can I paint over spray foam",
+    "does it meet fire safety standards",
+    "will it stop condensation problems",
+    "sound dampening properties"
+]
+
 def test_app_with_queries():
     """Test the app with 10 challenging queries"""
     
@@ -22,22 +41,7 @@ def test_app_with_queries():
         print(f"❌ Failed to initialize app: {e}")
         return
     
-    # Test queries (4 failing + 6 additional)
-    test_queries = [
-        # Original failing queries
-        "what about cables in the subfloor?",
-        "IS IT SAFE FOR DOGS INCASE THEY EAT IT?",
-        "It would be a nightmare to rewire under there",  
-        "how much pm2",
-        
-        # Additional challenging queries
-        "R-value per inch",
-        "installation cost",
-        "can I paint over spray foam",
-        "does it meet fire safety standards",
-        "will it stop condensation problems",
-        "sound dampening properties"
-    ]
+    test_queries = CHALLENGING_QUERIES
     
     print("\n=== TESTING APP WITH 10 CHALLENGING QUERIES ===")
     
@@ -119,6 +123,67 @@ def test_app_with_queries():
         print("❌ NEEDS WORK: App requires more improvements")
         return False
 
+def cascade_agreement(generator: YetifoamEnhancedResponseGenerator, test_queries: list, max_results: int = 5,
+                      rerank_depth: int = None):
+    """(queries compared, top-1 agreement %, top-k overlap %) of the fuzzy cascade against exhaustive scoring
+
+    Queries that exhaustive scoring finds nothing for are skipped - two empty lists agree trivially.
+    """
+    compared = 0
+    top1_agree = 0
+    overlap_total = 0.0
+    for query in test_queries:
+        exhaustive = generator.rank_fuzzy_matches(query, max_results, exhaustive=True)
+        if not exhaustive:
+            continue
+        cascade = generator.rank_fuzzy_matches(query, max_results, rerank_depth=rerank_depth)
+        
+        exhaustive_ids = [result.get('original_index') for result in exhaustive]
+        cascade_ids = [result.get('original_index') for result in cascade]
+        
+        compared += 1
+        top1_agree += exhaustive_ids[:1] == cascade_ids[:1]
+        overlap_total += len(set(exhaustive_ids) & set(cascade_ids)) / len(exhaustive_ids)
+    
+    if not compared:
+        return 0, 0.0, 0.0
+    return compared, top1_agree / compared * 100, overlap_total / compared * 100
+
+def check_cascade_fidelity(generator: YetifoamEnhancedResponseGenerator, test_queries: list, max_results: int = 5,
+                           rerank_depth: int = None):
+    compared, top1_rate, overlap_rate = cascade_agreement(generator, test_queries, max_results, rerank_depth)
+    
+    print(f"\n=== FUZZY CASCADE FIDELITY ({compared}/{len(test_queries)} queries compared, top {max_results}) ===")
+    print(f"Rerank depth: {rerank_depth or generator.fuzzy_rerank_depth}")
+    print(f"Top-1 agreement: {top1_rate:.1f}%")
+    print(f"Top-{max_results} overlap: {overlap_rate:.1f}%")
+    
+    # Most queries must have real results, otherwise the agreement says nothing
+    assert compared >= len(test_queries) * 0.8, f"Only {compared} of {len(test_queries)} queries had fuzzy matches"
+    assert top1_rate >= 95, f"Cascade top-1 agreement too low: {top1_rate:.1f}%"
+    return top1_rate, overlap_rate
+
+def test_fuzzy_cascade_fidelity(max_results: int = 5, rerank_depth: int = None):
+    """Check the cheap-first fuzzy cascade returns the same top results as exhaustive scoring"""
+    generator = YetifoamEnhancedResponseGenerator()
+    
+    # Every stored question plus the challenging queries above
+    test_queries = [item.get('original_query', '') for item in generator.dataset if item.get('original_query')]
+    test_queries += CHALLENGING_QUERIES
+    check_cascade_fidelity(generator, test_queries, max_results, rerank_depth)
+
+def test_fuzzy_cascade_fidelity_on_synthetic_corpus(max_results: int = 5, rerank_depth: int = None):
+    """Same check on a larger generated corpus with typo and paraphrase queries"""
+    corpus = generate_corpus(250, seed=3)
+    test_queries = [entry['query'] for entry in generate_queries(corpus, 30, seed=4)] + CHALLENGING_QUERIES
+    
+    with tempfile.TemporaryDirectory() as directory:
+        path = write_corpus(os.path.join(directory, 'synthetic_responses.parquet'), corpus)
+        generator = YetifoamEnhancedResponseGenerator(path, use_index_snapshot=False)
+        check_cascade_fidelity(generator, test_queries, max_results, rerank_depth)
+
 if __name__ == "__main__":
     success = test_app_with_queries()
+    test_fuzzy_cascade_fidelity()
+    test_fuzzy_cascade_fidelity_on_synthetic_corpus()
     exit(0 if success else 1)
\ No newline at end of file
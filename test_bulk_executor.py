@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Test bulk processing: the worker pool returns exactly what in-process search returns
+"""
+import sys
+import os
+
+# Add current directory to path
+sys.path.append(os.path.dirname(__file__))
+
+from test_app_queries import CHALLENGING_QUERIES
+from yetifoam_enhanced_final_streamlit_app import YetifoamEnhancedResponseGenerator
+from yetifoam_simple_enhanced_tester import ENHANCED_TEST_QUERIES
+
+# Repeats and a blank line, as pasted bulk lists have them
+BULK_QUERIES = CHALLENGING_QUERIES + ENHANCED_TEST_QUERIES + CHALLENGING_QUERIES[:4] + ['']
+
+def bulk_results(generator: YetifoamEnhancedResponseGenerator, queries=BULK_QUERIES):
+    """(query, results) for every query, without the timings"""
+    return [(query, results) for query, results, _ in generator.process_bulk_queries(queries, max_results=5)]
+
+def test_pool_results_match_in_process_results():
+    generator = YetifoamEnhancedResponseGenerator()
+    generator.bulk_workers = 1
+    in_process = bulk_results(generator)
+
+    generator.bulk_workers = 2
+    generator.bulk_parallel_min_queries = 8
+    try:
+        pooled = bulk_results(generator)
+        # The pool really served the job
+        assert generator._bulk_executor is not None
+
+        # A pool failing part-way hands the rest to the same search in-process
+        executor = generator._get_bulk_executor(generator.complete_matcher)
+        pool_map = executor.map
+
+        def failing_map(queries, count=3, retriever='fuzzy'):
+            for position, item in enumerate(pool_map(queries, count, retriever)):
+                if position == 10:
+                    raise RuntimeError("worker died")
+                yield item
+
+        executor.map = failing_map
+        mixed = bulk_results(generator)
+        assert generator._bulk_executor is None
+    finally:
+        if generator._bulk_executor is not None:
+            generator._bulk_executor.shutdown(wait=True)
+
+    assert [query for query, _ in in_process] == BULK_QUERIES
+    assert pooled == in_process
+    assert mixed == in_process
+
+if __name__ == "__main__":
+    test_pool_results_match_in_process_results()
+    print("✅ Bulk executor tests passed")
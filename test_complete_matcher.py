@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test CompleteMatcher search paths against each other on the unified dataset
+"""
+import sys
+import os
+import tempfile
+
+# Add current directory to path
+sys.path.append(os.path.dirname(__file__))
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from complete_semantic_matcher import CompleteMatcher
+from dataset_cleaner import detect_corruption
+from query_cache import QueryCache
+from test_app_queries import CHALLENGING_QUERIES
+from yetifoam_simple_enhanced_tester import ENHANCED_TEST_QUERIES
+
+DATASET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'unified_responses.parquet')
+
+def load_matcher() -> CompleteMatcher:
+    """Matcher over the unified dataset with result caching disabled"""
+    matcher = CompleteMatcher(DATASET_PATH, use_snapshot=False)
+    matcher.cache = QueryCache(max_entries=0)
+    return matcher
+
+def parity_queries(matcher: CompleteMatcher) -> list:
+    """Every stored question plus the tester queries, with repeats and blanks"""
+    queries = [item.get('original_query', '') for item in matcher.responses if item.get('original_query')]
+    queries += CHALLENGING_QUERIES + ENHANCED_TEST_QUERIES
+    return queries + queries[:5] + ['', '   ']
+
+def test_bound_pruning_keeps_results():
+    """Skipping rows that cannot beat the current k-th best leaves the results unchanged"""
+    matcher = load_matcher()
+    queries = parity_queries(matcher)
+
+    for retriever in ('fuzzy', 'bm25'):
+        pruned = [matcher.find_top_matches(query, 5, retriever) for query in queries]
+        matcher.prune_bounds = False
+        unpruned = [matcher.find_top_matches(query, 5, retriever) for query in queries]
+        matcher.prune_bounds = True
+        assert pruned == unpruned, f"Bound pruning changed results ({retriever})"
+
+def test_cached_results_follow_pruning_settings():
+    """Results cached under one pruning setting are not served after it changes"""
+    matcher = load_matcher()
+    matcher.cache = QueryCache()
+    query = "It would be a nightmare to rewire under there"
+
+    matcher.find_best_with_alternatives(query, 3)
+    matcher.prune_candidates = False
+    exhaustive = matcher.find_best_with_alternatives(query, 3)
+    assert matcher.cache.stats()['hits'] == 0
+
+    fresh = load_matcher()
+    fresh.prune_candidates = False
+    assert exhaustive == fresh.find_best_with_alternatives(query, 3)
+
+    matcher.rerank_depth = 5
+    matcher.find_best_with_alternatives(query, 3, 'bm25')
+    matcher.rerank_depth = 10
+    matcher.find_best_with_alternatives(query, 3, 'bm25')
+    assert matcher.cache.stats()['hits'] == 0
+
+    matcher.find_best_with_alternatives(query, 3, 'bm25')
+    assert matcher.cache.stats()['hits'] == 1
+
+def write_dataset(directory: str, records: list) -> str:
+    """Small parquet dataset in the unified schema"""
+    path = os.path.join(directory, 'responses.parquet')
+    pq.write_table(pa.Table.from_pylist(records), path)
+    return path
+
+def test_rows_matching_corruption_patterns_are_still_searched():
+    """Ordinary phrases like "phone call" trip the corruption patterns but must not hide a row"""
+    records = [
+        {'original_query': 'How do I book a quote?', 'category': 'Call to action / Quote requests',
+         'response': 'Give our Customer Service team a phone call and we will book a free site visit.',
+         'source': 'test', 'original_index': 'test_0'},
+        {'original_query': 'Is spray foam safe for pets?', 'category': 'Safety',
+         'response': 'Once cured, Yetifoam is inert and non-toxic for pets.',
+         'source': 'test', 'original_index': 'test_1'},
+    ]
+    assert detect_corruption(records[0]['response'])
+
+    with tempfile.TemporaryDirectory() as directory:
+        matcher = CompleteMatcher(write_dataset(directory, records))
+        matcher.cache = QueryCache(max_entries=0)
+        assert matcher.index.live_ids() == [0, 1]
+
+        best_result, top_matches = matcher.find_best_with_alternatives("phone call to book a quote", 2)
+        assert top_matches[0]['original_index'] == 'test_0'
+        assert best_result['response'].endswith('book a free site visit.')
+
+if __name__ == "__main__":
+    test_bound_pruning_keeps_results()
+    test_cached_results_follow_pruning_settings()
+    test_rows_matching_corruption_patterns_are_still_searched()
+    print("✅ CompleteMatcher tests passed")
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Test dataset hot reload: watcher debounce and failed reloads keeping the current engine
+"""
+import sys
+import os
+import shutil
+import tempfile
+
+# Add current directory to path
+sys.path.append(os.path.dirname(__file__))
+
+from dataset_watcher import DatasetWatcher, file_signature
+from yetifoam_enhanced_final_streamlit_app import YetifoamEnhancedResponseGenerator
+
+DATASET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'unified_responses.parquet')
+
+def write_file(path: str, content: bytes):
+    with open(path, 'wb') as file:
+        file.write(content)
+
+def test_watcher_waits_for_a_stable_signature():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'responses.parquet')
+        write_file(path, b'v1')
+        changes = []
+        watcher = DatasetWatcher(path, lambda: changes.append(file_signature(path)))
+
+        assert not watcher.poll()
+
+        # A file still being written changes between polls and is not loaded
+        write_file(path, b'v2 partial')
+        assert not watcher.poll()
+        write_file(path, b'v2 partial, more')
+        assert not watcher.poll()
+
+        # Two identical polls in a row trigger exactly one reload
+        assert watcher.poll()
+        assert changes == [file_signature(path)]
+        assert watcher.loaded_signature == file_signature(path)
+        assert not watcher.poll()
+        assert not watcher.poll()
+        assert len(changes) == 1
+
+def make_generator(directory: str) -> YetifoamEnhancedResponseGenerator:
+    """App generator serving a copy of the unified dataset in `directory`, with a (not started) watcher"""
+    path = os.path.join(directory, 'unified_responses.parquet')
+    shutil.copyfile(DATASET_PATH, path)
+    generator = YetifoamEnhancedResponseGenerator(path)
+    generator.dataset_watcher = DatasetWatcher(path, generator.load_dataset, loaded_signature=generator.engine.source_signature)
+    return generator
+
+def test_failed_reload_keeps_current_generation():
+    with tempfile.TemporaryDirectory() as directory:
+        generator = make_generator(directory)
+        engine = generator.engine
+        assert generator.load_status[0] == 'success'
+
+        write_file(generator.unified_dataset_path, b'not a parquet file')
+        generator.load_dataset()
+
+        assert generator.complete_matcher is engine.complete_matcher
+        assert generator.dataset is engine.dataset
+        assert generator.engine.number == engine.number
+        assert generator.load_status[0] == 'warning'
+        assert generator.search_responses("is it safe for dogs", max_results=1)
+
+def test_failed_reload_is_not_retried_until_the_file_changes():
+    with tempfile.TemporaryDirectory() as directory:
+        generator = make_generator(directory)
+        watcher = generator.dataset_watcher
+        engine = generator.engine
+        attempts = []
+        watcher.on_change = lambda: (attempts.append(1), generator.load_dataset())
+
+        write_file(generator.unified_dataset_path, b'not a parquet file')
+        bad_signature = file_signature(generator.unified_dataset_path)
+        assert not watcher.poll()
+        assert watcher.poll()
+        assert generator.load_status[0] == 'warning'
+        assert watcher.loaded_signature == bad_signature
+
+        # The bad file is not rebuilt on every poll
+        for _ in range(4):
+            assert not watcher.poll()
+        assert len(attempts) == 1
+
+        # Fixing the file loads a new generation
+        shutil.copyfile(DATASET_PATH, generator.unified_dataset_path)
+        assert not watcher.poll()
+        assert watcher.poll()
+        assert len(attempts) == 2
+        assert generator.load_status[0] == 'success'
+        assert generator.engine.number == engine.number + 1
+        assert watcher.loaded_signature == file_signature(generator.unified_dataset_path)
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith('test_'):
+            test()
+    print("✅ Dataset reload tests passed")
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Test field weight selection and field-weighted scoring for each dataset structure
+"""
+import sys
+import os
+
+# Add current directory to path
+sys.path.append(os.path.dirname(__file__))
+
+from field_scoring import (CLEAN_FIELD_WEIGHTS, LEGACY_FIELD_WEIGHTS, UNIFIED_FIELD_WEIGHTS,
+                           field_weighted_score, field_weights_for, weighted_fields)
+from response_store import ResponseStore
+
+UNIFIED_ROW = {
+    'original_query': 'Is spray foam safe for pets?',
+    'response': 'Once cured, Yetifoam is inert and non-toxic for pets.',
+    'category': 'Safety',
+    'source': 'test',
+    'original_index': 'test_0',
+}
+
+def test_each_structure_gets_its_weight_table():
+    assert field_weights_for({'response': 'a', 'question': 'b'}) is CLEAN_FIELD_WEIGHTS
+    assert field_weights_for(UNIFIED_ROW) is UNIFIED_FIELD_WEIGHTS
+    assert field_weights_for({'standardized_response': 'a', 'category': 'b'}) is LEGACY_FIELD_WEIGHTS
+
+def test_unified_row_yields_response_and_question():
+    expected = [(UNIFIED_ROW['response'], 0.60), (UNIFIED_ROW['original_query'], 0.30), ('Safety', 0.10)]
+    assert weighted_fields(UNIFIED_ROW) == expected
+
+    # Rows read from the columnar store select the same fields
+    store = ResponseStore.from_records([UNIFIED_ROW])
+    assert weighted_fields(store[0]) == expected
+
+def test_each_field_is_scored_once():
+    calls = []
+
+    def scorer(query, text):
+        calls.append(text)
+        return 100.0 if 'pets' in text else 0.0
+
+    score = field_weighted_score("pets", weighted_fields(UNIFIED_ROW), scorer)
+    assert len(calls) == 3
+    assert abs(score - 90.0) < 1e-9
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith('test_'):
+            test()
+    print("✅ Field scoring tests passed")
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Test incremental dataset updates: add/replace/remove, tombstones, compaction and save-then-reload
+"""
+import sys
+import os
+import shutil
+import tempfile
+
+# Add current directory to path
+sys.path.append(os.path.dirname(__file__))
+
+import numpy as np
+
+from bm25_retriever import BM25Retriever
+from complete_semantic_matcher import CompleteMatcher, tokenize
+from query_cache import QueryCache
+from response_store import ResponseStore
+from test_app_queries import CHALLENGING_QUERIES
+
+DATASET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'unified_responses.parquet')
+
+NEW_RESPONSES = [
+    {'original_query': 'Can Yetifoam be used in a wine cellar?', 'category': 'Suitability',
+     'response': 'Yes - closed cell Yetifoam keeps a wine cellar at a stable temperature and humidity.',
+     'source': 'update', 'original_index': 'update_0'},
+    {'original_query': 'Do you insulate shipping containers?', 'category': 'Suitability',
+     'response': 'We spray shipping containers regularly; the foam stops condensation on the steel walls.',
+     'source': 'update', 'original_index': 'update_1'},
+]
+
+def load_matcher(path: str) -> CompleteMatcher:
+    matcher = CompleteMatcher(path)
+    matcher.cache = QueryCache(max_entries=0)
+    return matcher
+
+def copy_dataset(directory: str) -> str:
+    path = os.path.join(directory, 'unified_responses.parquet')
+    shutil.copyfile(DATASET_PATH, path)
+    return path
+
+def top_answers(matcher: CompleteMatcher, queries, retriever: str = 'fuzzy'):
+    """(original_index, score) of the top 3 matches per query, independent of row ids"""
+    return [
+        [(match['original_index'], round(match['score'], 6)) for match in matcher.find_best_with_alternatives(query, 3, retriever)[1]]
+        for query in queries
+    ]
+
+def test_store_extend_grows_every_column_once():
+    store = ResponseStore.from_records([{'response': 'a', 'category': 'General', 'quality_score': 1}])
+    store.columns['quality_score'] = np.array([1])
+    revision = store.revision
+
+    row_ids = store.extend([
+        {'response': 'b', 'category': 'Safety', 'quality_score': 2.5},
+        {'response': 'c', 'category': 'General', 'is_corrupted': False},
+    ])
+
+    assert row_ids == [1, 2]
+    assert len(store) == 3 and store.revision == revision + 1
+    assert store.column_values('quality_score') == [1.0, 2.5, None]
+    assert store.column_values('category') == ['General', 'Safety', 'General']
+    assert store.column_values('is_corrupted') == [None, None, False]
+    assert store.append({'response': 'd'}) == 3
+
+def test_bm25_incremental_matches_full_build():
+    records = [{'response': f"spray foam answer {i} " + 'mould ' * (i % 3), 'original_query': f"question {i}",
+                'category': 'General'} for i in range(12)]
+    incremental = BM25Retriever(records[:5], tokenize)
+    # Searches between batches see the rows added so far
+    assert len(incremental.score("mould")) == 5
+    incremental.add_documents(records[5:9])
+    incremental.add_documents(records[9:])
+    full = BM25Retriever(records, tokenize)
+
+    for query in ("spray foam mould", "question 11", "answer"):
+        assert np.allclose(incremental.score(query), full.score(query))
+
+    compacted = incremental.compacted([0, 2, 4, 6])
+    assert np.allclose(compacted.score("mould question"), BM25Retriever([records[i] for i in (0, 2, 4, 6)], tokenize).score("mould question"))
+
+def test_add_replace_and_remove_on_a_fork():
+    with tempfile.TemporaryDirectory() as directory:
+        matcher = load_matcher(copy_dataset(directory))
+        live_before = len(matcher.index.live_ids())
+        first_key = matcher.responses.value('original_index', 0)
+
+        fork = matcher.fork()
+        row_ids = fork.add_responses(NEW_RESPONSES)
+        replacement = dict(NEW_RESPONSES[0], response='Yetifoam suits wine cellars, cool rooms and cold stores.')
+        fork.add_responses([replacement])
+        removed = fork.remove_responses([first_key, 'no such key'])
+
+        assert removed == 1
+        assert len(fork.index.live_ids()) == live_before + 1
+        # The replaced and removed rows are tombstoned, not deleted
+        assert row_ids[0] in fork.responses.deleted and 0 in fork.responses.deleted
+        assert fork.index.excluded == fork.responses.deleted
+        assert fork.dataset_version != matcher.dataset_version
+
+        for retriever in ('fuzzy', 'bm25'):
+            best_match = fork.find_best_with_alternatives("can yetifoam be used in a wine cellar", 3, retriever)[1][0]
+            assert best_match['original_index'] == 'update_0'
+            assert best_match['response_text'] == replacement['response']
+            assert fork.find_best_with_alternatives("do you insulate shipping containers", 3, retriever)[1][0]['original_index'] == 'update_1'
+            assert first_key not in [match['original_index'] for match in fork.find_top_matches(matcher.responses.value('original_query', 0), 70, retriever)]
+
+        # The original matcher still serves the old rows
+        assert len(matcher.responses) == live_before and not matcher.responses.deleted
+        assert len(matcher.index.live_ids()) == live_before
+        assert 'cellar' not in matcher.bm25.vocabulary
+        assert matcher.find_best_with_alternatives("can yetifoam be used in a wine cellar", 3)[1][0]['source'] != 'update'
+
+def test_compaction_matches_a_full_rebuild():
+    with tempfile.TemporaryDirectory() as directory:
+        matcher = load_matcher(copy_dataset(directory))
+        keys = [matcher.responses.value('original_index', row_id) for row_id in range(20)]
+
+        fork = matcher.fork()
+        fork.add_responses(NEW_RESPONSES)
+        fork.remove_responses(keys)
+        assert fork.needs_compaction()
+        compacted = fork.compacted()
+
+        assert not compacted.responses.deleted and not compacted.index.excluded
+        assert compacted.index.live_ids() == list(range(len(matcher.responses) - 20 + len(NEW_RESPONSES)))
+
+        rebuilt_path = os.path.join(directory, 'rebuilt.parquet')
+        compacted.responses.to_dataframe().to_parquet(rebuilt_path, index=False)
+        rebuilt = load_matcher(rebuilt_path)
+        queries = CHALLENGING_QUERIES + ["wine cellar", "shipping containers"]
+        for retriever in ('fuzzy', 'bm25'):
+            assert top_answers(compacted, queries, retriever) == top_answers(rebuilt, queries, retriever)
+        assert np.allclose(compacted.bm25.score("spray foam mould"), rebuilt.bm25.score("spray foam mould"))
+
+def test_save_then_reload():
+    with tempfile.TemporaryDirectory() as directory:
+        path = copy_dataset(directory)
+        matcher = load_matcher(path)
+        first_key = matcher.responses.value('original_index', 0)
+
+        fork = matcher.fork()
+        fork.add_responses(NEW_RESPONSES)
+        fork.remove_responses([first_key])
+        fork.save(path)
+
+        reloaded = load_matcher(path)
+        assert len(reloaded.responses) == len(matcher.responses) + 1
+        assert not reloaded.responses.deleted
+        assert reloaded.matches_source()
+        assert first_key not in reloaded.responses.column_values('original_index')
+
+        queries = CHALLENGING_QUERIES + ["wine cellar", "shipping containers"]
+        for retriever in ('fuzzy', 'bm25'):
+            assert top_answers(reloaded, queries, retriever) == top_answers(fork, queries, retriever)
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith('test_'):
+            test()
+    print("✅ Incremental update tests passed")
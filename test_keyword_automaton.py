@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Test the Aho-Corasick keyword matcher against plain `keyword in text` checks
+"""
+import sys
+import os
+
+# Add current directory to path
+sys.path.append(os.path.dirname(__file__))
+
+import pyarrow.parquet as pq
+
+from keyword_automaton import KeywordAutomaton
+from quality_scoring import QUALITY_AUTOMATON, QUALITY_BONUS_TERMS, QUALITY_KEYWORDS
+
+DATASET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'unified_responses.parquet')
+
+def substring_hits(keyword_groups, text):
+    """What the automaton replaced: one substring scan per keyword"""
+    hits = {}
+    for group, keywords in keyword_groups.items():
+        found = {keyword for keyword in keywords if keyword and keyword in text}
+        if found:
+            hits[group] = found
+    return hits
+
+def test_overlapping_and_nested_keywords():
+    groups = {
+        'pets': ['dog', 'dogs', 'pet'],
+        'wiring': ['wire', 'wiring', 'rewire'],
+        'heat': ['he', 'she', 'his', 'hers'],
+        'empty': ['']
+    }
+    automaton = KeywordAutomaton(groups)
+    for text in ["is it safe for dogs", "rewiring the subfloor", "ushers", "", "nothing here", "petdogwire"]:
+        assert automaton.search(text) == substring_hits(groups, text), text
+
+def test_matched_groups_keep_declaration_order():
+    automaton = KeywordAutomaton({'b': ['foam'], 'a': ['spray'], 'c': ['mould']})
+    assert automaton.matched_groups("spray foam") == ['b', 'a']
+    assert automaton.matched_groups("SPRAY FOAM") == []
+
+def test_same_keyword_in_several_groups():
+    automaton = KeywordAutomaton({'thermal': ['r value', 'insulation'], 'product': ['insulation']})
+    assert automaton.search("closed cell insulation") == {'thermal': {'insulation'}, 'product': {'insulation'}}
+
+def test_quality_keywords_match_substring_scan_on_dataset():
+    groups = {**QUALITY_KEYWORDS, **QUALITY_BONUS_TERMS}
+    for record in pq.read_table(DATASET_PATH).to_pylist():
+        for text in (record.get('response'), record.get('original_query')):
+            text = str(text or '').lower()
+            assert QUALITY_AUTOMATON.search(text) == substring_hits(groups, text)
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith('test_'):
+            test()
+    print("✅ Keyword automaton tests passed")
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Test the search result cache: expiry, LRU eviction, dataset versions and copy semantics
+"""
+import sys
+import os
+import time
+
+# Add current directory to path
+sys.path.append(os.path.dirname(__file__))
+
+from query_cache import QueryCache, canonicalize_query
+
+def test_entries_expire_after_ttl():
+    cache = QueryCache(max_entries=4, ttl_seconds=0.05)
+    cache.put('v1', 'spray foam', {'score': 90})
+    assert cache.get('v1', 'spray foam') == {'score': 90}
+
+    time.sleep(0.1)
+    assert cache.get('v1', 'spray foam') is None
+    assert cache.stats()['entries'] == 0
+
+def test_least_recently_used_entry_is_evicted():
+    cache = QueryCache(max_entries=2)
+    cache.put('v1', 'a', 1)
+    cache.put('v1', 'b', 2)
+    # Reading 'a' makes 'b' the least recently used
+    assert cache.get('v1', 'a') == 1
+    cache.put('v1', 'c', 3)
+
+    assert cache.get('v1', 'b') is None
+    assert cache.get('v1', 'a') == 1
+    assert cache.get('v1', 'c') == 3
+
+def test_versions_are_cached_side_by_side():
+    cache = QueryCache(max_entries=4)
+    cache.put('v1', 'query', 'old answer')
+
+    # A new dataset version never sees the old entry...
+    assert cache.get('v2', 'query') is None
+    cache.put('v2', 'query', 'new answer')
+    assert cache.get('v2', 'query') == 'new answer'
+
+    # ...and does not wipe entries still used by sessions on the old version
+    assert cache.get('v1', 'query') == 'old answer'
+    assert cache.stats()['dataset_versions'] == 2
+
+def test_versions_share_the_entry_limit():
+    cache = QueryCache(max_entries=2)
+    cache.put('v1', 'a', 1)
+    cache.put('v2', 'a', 2)
+    cache.put('v3', 'a', 3)
+
+    assert cache.get('v1', 'a') is None
+    assert cache.stats()['entries'] == 2
+
+def test_callers_get_copies():
+    cache = QueryCache()
+    result = {'response': 'Yetifoam is non-toxic once cured', 'matches': [{'score': 88}]}
+    cache.put('v1', 'safe for dogs', result)
+
+    # Changing the stored or the returned value does not change the cache
+    result['matches'].append({'score': 10})
+    first = cache.get('v1', 'safe for dogs')
+    first['response'] = 'Based on closest match: ' + first['response']
+    first['matches'][0]['score'] = 0
+
+    assert cache.get('v1', 'safe for dogs') == {'response': 'Yetifoam is non-toxic once cured', 'matches': [{'score': 88}]}
+
+def test_disabled_cache_stores_nothing():
+    cache = QueryCache(max_entries=0)
+    cache.put('v1', 'query', 'answer')
+    assert cache.get('v1', 'query') is None
+    assert cache.stats() == {'hits': 0, 'misses': 1, 'hit_rate': 0.0, 'entries': 0,
+                             'max_entries': 0, 'dataset_versions': 0}
+
+def test_canonical_queries_share_a_key():
+    assert canonicalize_query("  Spray   FOAM mould ") == canonicalize_query("spray foam mould")
+    assert canonicalize_query(None) == ""
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith('test_'):
+            test()
+    print("✅ Query cache tests passed")
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Test the single-pass text normalizer against the per-pattern substitution loop it replaced
+"""
+import re
+import sys
+import os
+
+# Add current directory to path
+sys.path.append(os.path.dirname(__file__))
+
+import pyarrow.parquet as pq
+
+from test_app_queries import CHALLENGING_QUERIES
+from text_normalizer import TECHNICAL_ENTITIES, TextNormalizer, default_normalizer
+from yetifoam_simple_enhanced_tester import ENHANCED_TEST_QUERIES
+
+DATASET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'unified_responses.parquet')
+
+# Inputs where expansions feed later patterns or several entities sit side by side
+TRICKY_TEXTS = [
+    "R-Value of spray foam vs thermal resistance",
+    "Does it meet AS 1530.3 fire safety?",
+    "cold bridge / heat transfer",
+    "Soundproofing & acoustic noise reduction",
+    "installing in Melbourne, VIC & TAS",
+    "DIY application over PVC wiring",
+    "mould in the subfloor - vapour barrier",
+    "energy efficient polyurethane foam",
+    "building code compliance",
+    "closed cell vs open cell",
+    "air seal moisture barrier",
+    "curing time on the substrate",
+    "braeside regional efficiency hvac eps",
+    "r_values and thermal conductivity",
+    "",
+]
+
+def loop_normalize(text: str) -> str:
+    """The original normalize_text: one re.sub per entity, each over the previous output"""
+    if not text:
+        return ""
+    normalized = text.lower()
+    normalized = re.sub(r'[^\w\s\-\.]', ' ', normalized)
+    normalized = re.sub(r'\s+', ' ', normalized)
+    for pattern, expansion in TECHNICAL_ENTITIES.items():
+        normalized = re.sub(pattern, expansion, normalized)
+    return re.sub(r'\s+', ' ', normalized).strip()
+
+def test_matches_substitution_loop():
+    texts = TRICKY_TEXTS + CHALLENGING_QUERIES + ENHANCED_TEST_QUERIES
+    for record in pq.read_table(DATASET_PATH).to_pylist():
+        texts += [str(record.get(field) or '') for field in ('original_query', 'response', 'category')]
+
+    normalizer = TextNormalizer()
+    for text in texts:
+        assert normalizer.normalize(text) == loop_normalize(text), text
+
+def test_custom_entity_table_cascades():
+    # The first expansion contains text the second pattern rewrites, as the loop did
+    entities = {r'\bpu\b': 'polyurethane foam', r'\bfoam\b': 'foam insulation'}
+    normalizer = TextNormalizer(entities)
+    assert normalizer.normalize("PU!") == "polyurethane foam insulation"
+    assert normalizer.normalize("foam") == "foam insulation"
+
+def test_repeated_inputs_are_memoized():
+    normalizer = TextNormalizer()
+    normalizer.normalize("spray foam mould")
+    normalizer.normalize("spray foam mould")
+    assert normalizer.cache_info().hits == 1
+    assert default_normalizer.normalize("Spray Foam") == loop_normalize("Spray Foam")
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith('test_'):
+            test()
+    print("✅ Text normalizer tests passed")
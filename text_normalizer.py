@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Compiled text normalizer for Yetifoam fuzzy matching
+Expands industry terms in a single regex pass and memoizes repeated inputs
+"""
+import re
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+# Bump whenever the entity table or cleanup rules change (cached/persisted normalized text depends on it)
+NORMALIZER_VERSION = 1
+
+# Industry-specific abbreviation handling with entity recognition (applied in this order)
+TECHNICAL_ENTITIES = {
+    # Thermal performance terms
+    r'\br[-_]?values?\b': 'thermal resistance r value',
+    r'\bthermal\s+resistance\b': 'r value thermal resistance',
+    r'\bthermal\s+bridge\b': 'thermal bridging cold bridge heat transfer',
+    r'\bcold\s+bridge\b': 'thermal bridging cold bridge heat transfer',
+    r'\benergy\s+effic\w*\b': 'energy efficiency thermal performance',
+    r'\bthermal\s+conduct\w*\b': 'thermal conductivity thermal performance',
+    r'\bheat\s+transfer\b': 'thermal bridging heat transfer',
+
+    # Standards and compliance
+    r'\bas\s*[0-9]{4}[\.]?[0-9]*\b': 'australian standard as compliance',
+    r'\baustralian\s+standard\b': 'as compliance australian standard',
+    r'\bbuilding\s+code\b': 'compliance building standards regulations',
+    r'\bcompliance\b': 'standards compliance regulations',
+    r'\bfire\s+rating\b': 'fire safety as1530 fire performance',
+    r'\bfire\s+safety\b': 'fire rating fire performance as1530',
+
+    # Materials and products
+    r'\bspray\s+foam\b': 'yetifoam polyurethane closed cell insulation',
+    r'\bpolyurethane\s+foam\b': 'yetifoam closed cell polyurethane insulation',
+    r'\bclosed\s+cell\b': 'closed cell polyurethane yetifoam rigid foam',
+    r'\bopen\s+cell\b': 'open cell foam spray insulation',
+    r'\bvapou?r\s+barrier\b': 'moisture barrier vapour barrier air seal',
+    r'\bmoisture\s+barrier\b': 'vapour barrier moisture protection',
+    r'\bair\s+seal\b': 'airtight vapour barrier air sealing',
+
+    # Acoustic performance
+    r'\bsound\s*proof\w*\b': 'acoustic soundproofing sound dampening noise reduction',
+    r'\bacoustic\b': 'soundproofing sound dampening acoustic performance',
+    r'\bnoise\s+reduct\w*\b': 'soundproofing acoustic sound dampening',
+
+    # Installation and application
+    r'\binstal\w*\b': 'installation application install',
+    r'\bapplicat\w*\b': 'installation application install',
+    r'\bcuring\s+time\b': 'curing application installation',
+    r'\bsubstrate\b': 'surface application substrate preparation',
+
+    # Geographic and service areas
+    r'\bvic\b': 'victoria melbourne braeside',
+    r'\btas\b': 'tasmania service area regional',
+    r'\bmelb\w*\b': 'melbourne victoria braeside',
+    r'\bbraeside\b': 'melbourne victoria service area',
+    r'\bregional\b': 'victoria regional service areas',
+
+    # General abbreviations
+    r'\bdiy\b': 'do it yourself self install',
+    r'\bhvac\b': 'heating ventilation air conditioning',
+    r'\bpvc\b': 'polyvinyl chloride cable wiring',
+    r'\beps\b': 'expanded polystyrene foam insulation',
+    r'\bmould\b': 'mold moisture condensation',
+    r'\beffic\w*\b': 'efficiency performance effective'
+}
+
+class TextNormalizer:
+    """Lowercase, strip punctuation and expand technical entities in one pass"""
+
+    def __init__(self, entities: Dict[str, str] = None, cache_size: int = 8192):
+        entities = TECHNICAL_ENTITIES if entities is None else entities
+        self._punctuation = re.compile(r'[^\w\s\-\.]')
+        self._whitespace = re.compile(r'\s+')
+
+        # The old loop ran each pattern over the output of every earlier one, so an expansion
+        # could itself be rewritten by later patterns. Apply that cascade to the expansion
+        # strings once here so a single combined pass produces the same text.
+        table = list(entities.items())
+        self._patterns = [re.compile(pattern) for pattern, _ in table]
+        self._expansions = [
+            self._cascade(expansion, table[position + 1:])
+            for position, (_, expansion) in enumerate(table)
+        ]
+
+        # Earlier entries win when several alternatives match at the same position
+        self._combined = re.compile('|'.join(
+            f'(?P<e{position}>{pattern})' for position, (pattern, _) in enumerate(table)
+        ))
+
+        self.normalize = lru_cache(maxsize=cache_size)(self._normalize_uncached)
+
+    @staticmethod
+    def _cascade(expansion: str, later_entities: List[Tuple[str, str]]) -> str:
+        """Rewrite an expansion with every pattern that came after it in the table"""
+        for pattern, later_expansion in later_entities:
+            expansion = re.sub(pattern, later_expansion, expansion)
+        return expansion
+
+    def _expand(self, match: re.Match) -> str:
+        return self._expansions[int(match.lastgroup[1:])]
+
+    def _normalize_uncached(self, text: str) -> str:
+        if not text:
+            return ""
+
+        normalized = text.lower()
+
+        # Enhanced regex-based punctuation removal (preserve technical symbols)
+        normalized = self._punctuation.sub(' ', normalized)  # Keep hyphens and dots for technical terms
+        normalized = self._whitespace.sub(' ', normalized)  # Normalize whitespace
+
+        # Single pass technical entity recognition
+        normalized = self._combined.sub(self._expand, normalized)
+
+        # Final cleanup - remove extra spaces and normalize
+        return self._whitespace.sub(' ', normalized).strip()
+
+    def cache_info(self):
+        """Memoization hit/miss statistics"""
+        return self.normalize.cache_info()
+
+# Shared instance so the memo survives generator re-creation
+default_normalizer = TextNormalizer()
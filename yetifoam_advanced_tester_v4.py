@@ -24,6 +24,30 @@ except ImportError:
     print("fuzzywuzzy not available - using simplified matching")
     FUZZYWUZZY_AVAILABLE = False
 
+from field_scoring import LEGACY_FIELD_WEIGHTS, field_weighted_score, weighted_fields
+
+# Target problematic queries identified by Data Extractor Agent
+PROBLEMATIC_QUERIES = {
+    'zero_results_queries': [
+        "energy efficiency", "thermal bridge", "thermal performance", 
+        "cold bridging", "vapour barrier", "damp proofing", "fire rating",
+        "rodent control", "vermin proofing", "product guarantee", 
+        "long term performance", "durability", "polyurethane foam",
+        "open cell foam", "curing time", "thermal conductivity"
+    ],
+    'low_quality_queries': [
+        "spray foam mould", "R-value insulation", "fire safety", 
+        "soundproof acoustic", "Tasmania service", "cost price",
+        "installation time", "condensation moisture", "building standards"
+    ],
+    'edge_case_queries': [
+        "AS 1530 compliance", "moisture trap prevention", 
+        "Colorbond steel roof", "DIY installation kit",
+        "thermal bridging solution", "closed cell benefits",
+        "professional applicators", "substrate preparation"
+    ]
+}
+
 class YetifoamAdvancedTester:
     def __init__(self):
         """Initialize the advanced testing suite"""
@@ -32,26 +56,7 @@ class YetifoamAdvancedTester:
         self.load_dataset()
         
         # Target problematic queries identified by Data Extractor Agent
-        self.problematic_queries = {
-            'zero_results_queries': [
-                "energy efficiency", "thermal bridge", "thermal performance", 
-                "cold bridging", "vapour barrier", "damp proofing", "fire rating",
-                "rodent control", "vermin proofing", "product guarantee", 
-                "long term performance", "durability", "polyurethane foam",
-                "open cell foam", "curing time", "thermal conductivity"
-            ],
-            'low_quality_queries': [
-                "spray foam mould", "R-value insulation", "fire safety", 
-                "soundproof acoustic", "Tasmania service", "cost price",
-                "installation time", "condensation moisture", "building standards"
-            ],
-            'edge_case_queries': [
-                "AS 1530 compliance", "moisture trap prevention", 
-                "Colorbond steel roof", "DIY installation kit",
-                "thermal bridging solution", "closed cell benefits",
-                "professional applicators", "substrate preparation"
-            ]
-        }
+        self.problematic_queries = PROBLEMATIC_QUERIES
         
         # Quality keywords matching the enhanced app
         self.quality_keywords = {
@@ -133,8 +138,9 @@ class YetifoamAdvancedTester:
         
         return min(match_ratio * 100, 100)
 
-    def enhanced_fuzzy_search(self, query: str, text: str, category: str = "") -> Tuple[float, Dict[str, Any]]:
-        """Enhanced fuzzy matching with dynamic weighting"""
+    def enhanced_fuzzy_search(self, query: str, text: str, category: str = "",
+                              fields: List[Tuple[str, float]] = None) -> Tuple[float, Dict[str, Any]]:
+        """Enhanced fuzzy matching with dynamic weighting (field-weighted when `fields` is given)"""
         if not query or not text:
             return 0.0, {}
         
@@ -142,6 +148,9 @@ class YetifoamAdvancedTester:
         text_norm = self.normalize_text(text)
         category_norm = self.normalize_text(category)
         
+        # Each field is scored once and combined by weight; without fields the whole text is one field
+        field_norms = [(self.normalize_text(field_text), weight) for field_text, weight in fields] if fields else [(text_norm, 1.0)]
+        
         # Dynamic scoring based on query length
         query_length = len(query_norm.split())
         
@@ -154,10 +163,10 @@ class YetifoamAdvancedTester:
             else:
                 weights = {'token_set': 0.30, 'partial': 0.40, 'token_sort': 0.20, 'ratio': 0.10}
             
-            token_set_score = fuzz.token_set_ratio(query_norm, text_norm)
-            partial_score = fuzz.partial_ratio(query_norm, text_norm)
-            token_sort_score = fuzz.token_sort_ratio(query_norm, text_norm)
-            ratio_score = fuzz.ratio(query_norm, text_norm)
+            token_set_score = field_weighted_score(query_norm, field_norms, fuzz.token_set_ratio)
+            partial_score = field_weighted_score(query_norm, field_norms, fuzz.partial_ratio)
+            token_sort_score = field_weighted_score(query_norm, field_norms, fuzz.token_sort_ratio)
+            ratio_score = field_weighted_score(query_norm, field_norms, fuzz.ratio)
             
             base_score = (
                 token_set_score * weights['token_set'] +
@@ -167,7 +176,7 @@ class YetifoamAdvancedTester:
             )
         else:
             # Fallback to simple matching
-            base_score = self.simple_fuzzy_match(query_norm, text_norm)
+            base_score = field_weighted_score(query_norm, field_norms, self.simple_fuzzy_match)
             token_set_score = partial_score = token_sort_score = ratio_score = base_score
         
         # Enhanced contextual bonuses
@@ -313,26 +322,13 @@ class YetifoamAdvancedTester:
         
         return min(score, 100)
 
+    def get_searchable_fields(self, item: Dict[str, Any]) -> List[Tuple[str, float]]:
+        """Get (text, weight) per searchable field with field prioritization"""
+        return weighted_fields(item, LEGACY_FIELD_WEIGHTS)
+
     def get_searchable_text(self, item: Dict[str, Any]) -> str:
-        """Get searchable text with field prioritization"""
-        weighted_texts = []
-        
-        priority_fields = [
-            ('standardized_response', 0.50),
-            ('inferred_question', 0.30),
-            ('original_text', 0.20),
-            ('response_text', 0.15),
-            ('category', 0.05)
-        ]
-        
-        for field, weight in priority_fields:
-            if field in item and item[field]:
-                text = str(item[field]).strip()
-                if text:
-                    repetitions = max(1, int(weight * 5))
-                    weighted_texts.extend([text] * repetitions)
-        
-        return ' '.join(weighted_texts)
+        """Get searchable text, each field once"""
+        return ' '.join(text for text, _ in self.get_searchable_fields(item))
 
     def search_responses(self, query: str, confidence_threshold: float = 0.40, max_results: int = 10) -> List[Dict[str, Any]]:
         """Enhanced search with 75% threshold"""
@@ -342,12 +338,13 @@ class YetifoamAdvancedTester:
         results = []
         
         for item in self.dataset:
-            searchable_text = self.get_searchable_text(item)
-            if not searchable_text:
+            fields = self.get_searchable_fields(item)
+            if not fields:
                 continue
+            searchable_text = ' '.join(text for text, _ in fields)
             
             category = item.get('category', '')
-            confidence, scoring_details = self.enhanced_fuzzy_search(query, searchable_text, category)
+            confidence, scoring_details = self.enhanced_fuzzy_search(query, searchable_text, category, fields)
             
             threshold_percentage = confidence_threshold * 100
             if confidence >= threshold_percentage:
@@ -6,21 +6,24 @@ Version: 3.1 - Quality Enhancement Release
 Created: September 1, 2025
 """
 
-import streamlit as st
+from startup_timing import report as report_startup_timing, timed
+
+with timed("import streamlit"):
+    import streamlit as st
 import json
 import os
 import hashlib
 import secrets
-import base64
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, Iterator, List, Optional, Tuple, Any
 import re
-import pandas as pd
-from io import BytesIO, StringIO
+from io import BytesIO
 import time
-import zipfile
 import logging
-from functools import wraps
+import threading
+import heapq
+from functools import partial, wraps
+from operator import itemgetter
 
 # Configure Streamlit page
 st.set_page_config(
@@ -30,44 +33,62 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Install required packages if not available
-@st.cache_resource
-def install_requirements():
-    """Install required packages"""
-    try:
-        from fuzzywuzzy import fuzz, process
-        import reportlab
-        from reportlab.lib.pagesizes import letter, A4
-        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak
-        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-        from reportlab.lib.units import inch
-        return True
-    except ImportError:
-        with st.spinner("Installing required packages..."):
-            os.system("pip install fuzzywuzzy python-Levenshtein reportlab")
-        return True
-
-# Load packages after installation
-install_requirements()
-from fuzzywuzzy import fuzz, process
-import reportlab
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
+# Dependencies come from requirements.txt; pandas and reportlab are imported where they are used
+with timed("import fuzzywuzzy"):
+    from fuzzywuzzy import fuzz
 
 # Import complete semantic matcher for ALL responses
-from complete_semantic_matcher import CompleteMatcher
+with timed("import complete_semantic_matcher (numpy, scipy, pyarrow)"):
+    from complete_semantic_matcher import CompleteMatcher
+with timed("import app helpers"):
+    from text_normalizer import default_normalizer
+    from query_cache import search_cache
+    from dataset_cleaner import detect_corruption
+    from field_scoring import field_weighted_score, weighted_fields
+    from quality_scoring import (
+        QUALITY_KEYWORDS, calculate_quality_score, has_current_quality_scores, refresh_category_averages,
+        score_records, summarize_quality
+    )
+    from response_store import ResponseStore
+    from dataset_watcher import DatasetWatcher, file_signature
+    from bulk_executor import BulkExecutor, search_queries
+
+class EngineGeneration:
+    """One loaded dataset and its matcher; reloads build a new generation and swap it in whole"""
+
+    def __init__(self, number: int, dataset: ResponseStore, complete_matcher: Optional[CompleteMatcher],
+                 load_status: Tuple[str, str], source_signature: Optional[Tuple[int, int]] = None):
+        self.number = number
+        self.dataset = dataset
+        self.complete_matcher = complete_matcher
+        self.quality_summary = summarize_quality(list(dataset.live_rows()))
+        self.load_status = load_status
+        self.source_signature = source_signature
+        self.loaded_at = datetime.now()
 
 class YetifoamEnhancedResponseGenerator:
-    def __init__(self):
-        """Initialize the enhanced response generator with semantic matching"""
+    FUZZY_STOP_WORDS = {'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are', 'was', 'were', 'a', 'an'}
+
+    def __init__(self, dataset_path: str = None, use_index_snapshot: bool = True):
+        """Initialize the enhanced response generator with semantic matching
+
+        dataset_path defaults to the unified dataset next to this file; use_index_snapshot=False
+        always rebuilds the matcher index instead of loading or writing its snapshot.
+        """
         # Use absolute paths to ensure files are found regardless of working directory
         base_dir = os.path.dirname(os.path.abspath(__file__))
-        self.unified_dataset_path = os.path.join(base_dir, "unified_responses.parquet")
-        self.dataset = None
-        self.complete_matcher = None
-        self.load_dataset()
+        self.unified_dataset_path = dataset_path or os.path.join(base_dir, "unified_responses.parquet")
+        self.use_index_snapshot = use_index_snapshot
+        # Every session reads the current generation; a reload replaces it with a single assignment
+        self.engine = EngineGeneration(0, ResponseStore.from_records([]), None, ('error', "❌ Complete unified dataset not loaded"))
+        self._fuzzy_rows = None
+        self.dataset_watcher = None
+        # One instance serves every session in the process, so shared mutable state is lock-protected
+        self._lock = threading.RLock()
+        # Only one generation is built at a time; searches never wait on it
+        self._reload_lock = threading.Lock()
+        with timed("load_dataset"):
+            self.load_dataset()
         
         # Enhanced authentication settings with secure password handling
         self.staff_credentials = self._load_secure_credentials()
@@ -95,32 +116,148 @@ class YetifoamEnhancedResponseGenerator:
             }
         }
         
+        # Rows that survive the cheap first stage of rank_fuzzy_matches
+        self.fuzzy_rerank_depth = 20
+        
+        # Bulk jobs of at least this many queries are sharded across worker processes
+        self.bulk_workers = os.cpu_count() or 1
+        self.bulk_parallel_min_queries = 32
+        self._bulk_executor = None
+        
         # Quality enhancement keywords (expanded to match dataset content)
-        self.quality_keywords = {
-            'technical': ['spray foam', 'yetifoam', 'insulation', 'r-value', 'thermal', 'polyurethane', 'closed-cell', 'open-cell', 'foam', 'vapour barrier', 'air seal', 'thermal resistance', 'rigid', 'dense', 'substrate', 'application', 'curing'],
-            'standards': ['AS 1530', 'AS 3837', 'AS 3000', 'AS 3999', 'AS 3660', 'ASTM E96', 'australian standard', 'building code', 'compliance', 'class 2', 'class 1', 'certification', 'bal', 'bushfire attack level'],
-            'professional': ['recommend', 'professional', 'experience', 'quality', 'certified', 'installation', 'assessment', 'applicators', 'installers', 'calibrated', 'trained', 'site visit', 'quote', 'enquiry', 'contact'],
-            'locations': ['victoria', 'braeside', 'melbourne', 'tasmania', 'australia', 'victorian', 'dandenong', 'gippsland', 'wodonga', 'regional'],
-            'benefits': ['energy efficiency', 'moisture barrier', 'fire safety', 'pest control', 'soundproofing', 'rodent deterrent', 'sound dampening', 'structural integrity', 'air leakage', 'thermal bridging', 'condensation', 'mould', 'rot']
-        }
+        self.quality_keywords = QUALITY_KEYWORDS
         
-    def load_dataset(self):
-        """Load complete unified dataset and initialize matcher"""
-        try:
-            if os.path.exists(self.unified_dataset_path):
-                df = pd.read_parquet(self.unified_dataset_path)
-                self.dataset = df.to_dict('records')
-                self.complete_matcher = CompleteMatcher(self.unified_dataset_path)
-                st.sidebar.success(f"✅ Complete dataset loaded: {len(self.dataset)} responses")
-                return len(self.dataset)
-            else:
-                st.sidebar.error("❌ Complete unified dataset not found")
-                self.dataset = []
-                return 0
-        except Exception as e:
-            st.sidebar.error(f"Dataset loading error: {e}")
-            self.dataset = []
-            return 0
+    @property
+    def dataset(self) -> ResponseStore:
+        return self.engine.dataset
+
+    @property
+    def complete_matcher(self) -> Optional[CompleteMatcher]:
+        return self.engine.complete_matcher
+
+    @property
+    def quality_summary(self) -> Dict[str, Any]:
+        return self.engine.quality_summary
+
+    @property
+    def load_status(self) -> Tuple[str, str]:
+        return self.engine.load_status
+
+    def _build_generation(self, number: int) -> EngineGeneration:
+        """Load the unified dataset into a new engine generation (raises if it cannot be loaded)"""
+        signature = file_signature(self.unified_dataset_path)
+        if signature is None:
+            raise FileNotFoundError("Complete unified dataset not found")
+        
+        # The matcher owns the single parquet read; the dataset shares its columnar store
+        with timed("CompleteMatcher"):
+            complete_matcher = CompleteMatcher(self.unified_dataset_path, use_snapshot=self.use_index_snapshot)
+        
+        # Quality scores are stored in the parquet at build time; only score here if they are missing or stale
+        with timed("quality scores"):
+            if not has_current_quality_scores(complete_matcher.responses):
+                score_records(complete_matcher.responses)
+        
+        status = ('success', f"✅ Complete dataset loaded: {len(complete_matcher.responses)} responses")
+        return EngineGeneration(number, complete_matcher.responses, complete_matcher, status, signature)
+
+    def load_dataset(self) -> int:
+        """Build a new engine generation from the unified dataset and swap it in for every session
+
+        Searches already running keep the generation they started with. If loading fails the
+        current generation stays in service (an empty one is installed only before the first load)
+        and the watcher keeps the signature of the file that failed, so only a further change retries.
+        """
+        with self._reload_lock:
+            current = self.engine
+            error = None
+            try:
+                generation = self._build_generation(current.number + 1)
+            except FileNotFoundError:
+                generation = None
+                error = ('error', "❌ Complete unified dataset not found")
+            except Exception as e:
+                generation = None
+                error = ('error', f"Dataset loading error: {e}")
+            
+            if generation is None:
+                if current.complete_matcher is None:
+                    generation = EngineGeneration(current.number + 1, ResponseStore.from_records([]), None, error)
+                else:
+                    level, message = error
+                    generation = EngineGeneration(
+                        current.number, current.dataset, current.complete_matcher,
+                        ('warning', f"{message} - still serving the dataset loaded {current.loaded_at:%H:%M:%S}"),
+                        current.source_signature
+                    )
+                    generation.loaded_at = current.loaded_at
+            
+            self.engine = generation
+            if error is None and self.dataset_watcher is not None:
+                self.dataset_watcher.loaded_signature = generation.source_signature
+            return len(generation.dataset) if generation.complete_matcher is not None else 0
+
+    def update_responses(self, records: List[Dict[str, Any]] = (), remove_keys: List[Any] = (),
+                         key: str = 'original_index', persist: bool = False) -> int:
+        """Add/replace and remove responses without a full reindex, then swap the result in for every session
+
+        The update is applied to a fork of the current matcher, so running searches are unaffected;
+        only the changed rows are indexed and scored. Tombstoned rows are compacted away once they pass
+        the matcher's compaction_ratio. persist=True also rewrites the unified dataset, its .arrow copy
+        and index snapshot (the file watcher then reloads from the snapshot). Returns the live row count.
+        """
+        with self._reload_lock:
+            current = self.engine
+            if current.complete_matcher is None:
+                raise RuntimeError("No dataset loaded to update")
+            
+            matcher = current.complete_matcher.fork()
+            matcher.add_responses(list(records), key)
+            matcher.remove_responses(list(remove_keys), key)
+            if matcher.needs_compaction():
+                matcher = matcher.compacted()
+            
+            # Score only the new rows; category averages are refreshed from the stored scores
+            live_rows = list(matcher.responses.live_rows())
+            score_records([row for row in live_rows if not has_current_quality_scores([row])])
+            refresh_category_averages(live_rows)
+            
+            signature = current.source_signature
+            if persist:
+                matcher.save(self.unified_dataset_path)
+                signature = file_signature(self.unified_dataset_path)
+                if self.dataset_watcher is not None:
+                    self.dataset_watcher.loaded_signature = signature
+            
+            status = ('success', f"✅ Complete dataset loaded: {len(live_rows)} responses (updated {datetime.now():%H:%M:%S})")
+            self.engine = EngineGeneration(current.number + 1, matcher.responses, matcher, status, signature)
+            return len(live_rows)
+
+    def reload_in_background(self) -> bool:
+        """Start building a new generation without blocking the caller; False if a reload is already running"""
+        if self._reload_lock.locked():
+            return False
+        threading.Thread(target=self.load_dataset, name='dataset-reload', daemon=True).start()
+        return True
+
+    def start_auto_reload(self, interval: float = 5.0) -> DatasetWatcher:
+        """Poll the unified dataset and reload in the background whenever it changes"""
+        with self._lock:
+            if self.dataset_watcher is None:
+                self.dataset_watcher = DatasetWatcher(
+                    self.unified_dataset_path, self.load_dataset, interval, self.engine.source_signature
+                )
+            return self.dataset_watcher.start()
+    
+    def show_load_status(self):
+        """Render the dataset load result in the sidebar for the current session"""
+        level, message = self.load_status
+        if level == 'success':
+            st.sidebar.success(message)
+        elif level == 'warning':
+            st.sidebar.warning(message)
+        else:
+            st.sidebar.error(message)
         
     def _load_secure_credentials(self) -> Dict[str, str]:
         """Load credentials securely from environment or Streamlit secrets"""
@@ -155,30 +292,32 @@ class YetifoamEnhancedResponseGenerator:
     
     def _is_account_locked(self, username: str) -> bool:
         """Check if account is locked due to failed attempts"""
-        if username not in self.failed_attempts:
+        with self._lock:
+            if username not in self.failed_attempts:
+                return False
+            
+            attempts, last_attempt = self.failed_attempts[username]
+            if attempts >= self.max_attempts:
+                if datetime.now() - last_attempt < timedelta(seconds=self.lockout_duration):
+                    return True
+                else:
+                    # Reset attempts after lockout period
+                    del self.failed_attempts[username]
             return False
-        
-        attempts, last_attempt = self.failed_attempts[username]
-        if attempts >= self.max_attempts:
-            if datetime.now() - last_attempt < timedelta(seconds=self.lockout_duration):
-                return True
-            else:
-                # Reset attempts after lockout period
-                del self.failed_attempts[username]
-        return False
     
     def _record_failed_attempt(self, username: str):
         """Record failed login attempt"""
-        if username not in self.failed_attempts:
-            self.failed_attempts[username] = [0, datetime.now()]
-        
-        self.failed_attempts[username][0] += 1
-        self.failed_attempts[username][1] = datetime.now()
+        with self._lock:
+            if username not in self.failed_attempts:
+                self.failed_attempts[username] = [0, datetime.now()]
+            
+            self.failed_attempts[username][0] += 1
+            self.failed_attempts[username][1] = datetime.now()
     
     def _reset_failed_attempts(self, username: str):
         """Reset failed attempts on successful login"""
-        if username in self.failed_attempts:
-            del self.failed_attempts[username]
+        with self._lock:
+            self.failed_attempts.pop(username, None)
 
     def get_response_text(self, item: Dict[str, Any]) -> str:
         """Extract response text from item, handling multiple field names"""
@@ -194,241 +333,47 @@ class YetifoamEnhancedResponseGenerator:
 
     def calculate_quality_score(self, text: str, category: str = "") -> float:
         """Advanced quality scoring targeting 70%+ with standards compliance focus"""
-        if not text:
-            return 0.0
-        
-        text_lower = text.lower()
-        category_lower = category.lower() if category else ""
-        
-        # Initialize scoring with reduced base score to prevent inflation
-        score = 25  # REDUCED base score to prevent artificial 100% scores
-        
-        # Technical keyword score (25 points) - enhanced for industry terms
-        tech_score = 0
-        for keyword in self.quality_keywords['technical']:
-            if keyword in text_lower:
-                # Weight important technical terms higher
-                if keyword in ['r-value', 'thermal resistance', 'polyurethane', 'closed-cell', 'vapour barrier']:
-                    tech_score += 4  # High-value technical terms
-                else:
-                    tech_score += 2  # Standard technical terms
-        score += min(tech_score, 25)
-        
-        # Standards compliance score (20 points) - CRITICAL for 70% target
-        standards_score = 0
-        for standard in self.quality_keywords['standards']:
-            if standard in text_lower:
-                # Australian standards are highest priority
-                if 'as ' in standard or 'australian standard' in standard:
-                    standards_score += 8  # High-value standards
-                elif 'astm' in standard or 'compliance' in standard:
-                    standards_score += 5  # Important compliance terms
-                else:
-                    standards_score += 3  # Other standards
-        score += min(standards_score, 20)
-        
-        # Professional language enhancement (10 points)
-        prof_score = 0
-        for prof_term in self.quality_keywords['professional']:
-            if prof_term in text_lower:
-                if prof_term in ['professional', 'certified', 'assessment', 'installation']:
-                    prof_score += 3  # Key professional terms
-                else:
-                    prof_score += 1
-        score += min(prof_score, 10)
-        
-        # Location and service accuracy (5 points)
-        location_score = 0
-        for location in self.quality_keywords['locations']:
-            if location in text_lower:
-                if location in ['victoria', 'braeside', 'melbourne']:
-                    location_score += 2  # Primary service areas
-                else:
-                    location_score += 1
-        score += min(location_score, 5)
-        
-        # Bonus scoring for category-specific quality indicators
-        category_bonus = 0
-        if category_lower:
-            # Fire Safety & Health category bonus
-            if 'fire safety' in category_lower:
-                if any(term in text_lower for term in ['as 1530', 'fire rating', 'class 1', 'class 2', 'fire performance']):
-                    category_bonus += 5
-            
-            # Thermal Performance category bonus  
-            elif 'thermal' in category_lower:
-                if any(term in text_lower for term in ['r-value', 'thermal resistance', 'r4', 'r-4', 'thermal bridging']):
-                    category_bonus += 5
-            
-            # Standards & Compliance category bonus
-            elif 'standards' in category_lower or 'compliance' in category_lower:
-                if any(term in text_lower for term in ['as ', 'australian standard', 'building code', 'compliance']):
-                    category_bonus += 5
-            
-            # Moisture Resistance category bonus
-            elif 'moisture' in category_lower:
-                if any(term in text_lower for term in ['vapour barrier', 'moisture barrier', 'astm e96', 'permeability']):
-                    category_bonus += 5
-        
-        score += category_bonus
-        
-        # Content depth and completeness scoring (enhanced)
-        if len(text) > 2000:  # Very comprehensive responses
-            score += 10
-        elif len(text) > 1000:  # Good detail level  
-            score += 8
-        elif len(text) > 500:   # Adequate detail
-            score += 6
-        elif len(text) > 200:   # Basic detail
-            score += 4
-        elif len(text) > 100:   # Minimal content
-            score += 2
-        else:  # Very short responses
-            score += 1
-        
-        # Final adjustments to reach 70% target
-        # Boost scores that show strong technical content but may be slightly under 70%
-        if score >= 65 and score < 70:
-            # Check for any strong indicators that should push over 70%
-            strong_indicators = [
-                'australian standard' in text_lower,
-                'as 1530' in text_lower,
-                'r-value' in text_lower or 'thermal resistance' in text_lower,
-                'professional installation' in text_lower,
-                'polyurethane' in text_lower and 'closed-cell' in text_lower
-            ]
-            
-            if sum(strong_indicators) >= 2:  # Multiple strong indicators present
-                score += 5  # Push over 70% threshold
-        
-        return min(score, 100)  # Cap at 100%
+        return calculate_quality_score(text, category)
 
     def normalize_text(self, text: str) -> str:
         """Advanced text normalization with industry-specific processing"""
-        if not text:
-            return ""
-        
-        # Convert to lowercase
-        normalized = text.lower()
-        
-        # Enhanced regex-based punctuation removal (preserve technical symbols)
-        normalized = re.sub(r'[^\w\s\-\.]', ' ', normalized)  # Keep hyphens and dots for technical terms
-        normalized = re.sub(r'\s+', ' ', normalized)  # Normalize whitespace
-        
-        # Industry-specific abbreviation handling with entity recognition
-        technical_entities = {
-            # Thermal performance terms
-            r'\br[-_]?values?\b': 'thermal resistance r value',
-            r'\bthermal\s+resistance\b': 'r value thermal resistance',
-            r'\bthermal\s+bridge\b': 'thermal bridging cold bridge heat transfer',
-            r'\bcold\s+bridge\b': 'thermal bridging cold bridge heat transfer',
-            r'\benergy\s+effic\w*\b': 'energy efficiency thermal performance',
-            r'\bthermal\s+conduct\w*\b': 'thermal conductivity thermal performance',
-            r'\bheat\s+transfer\b': 'thermal bridging heat transfer',
-            
-            # Standards and compliance
-            r'\bas\s*[0-9]{4}[\.]?[0-9]*\b': 'australian standard as compliance',
-            r'\baustralian\s+standard\b': 'as compliance australian standard',
-            r'\bbuilding\s+code\b': 'compliance building standards regulations',
-            r'\bcompliance\b': 'standards compliance regulations',
-            r'\bfire\s+rating\b': 'fire safety as1530 fire performance',
-            r'\bfire\s+safety\b': 'fire rating fire performance as1530',
-            
-            # Materials and products
-            r'\bspray\s+foam\b': 'yetifoam polyurethane closed cell insulation',
-            r'\bpolyurethane\s+foam\b': 'yetifoam closed cell polyurethane insulation',
-            r'\bclosed\s+cell\b': 'closed cell polyurethane yetifoam rigid foam',
-            r'\bopen\s+cell\b': 'open cell foam spray insulation',
-            r'\bvapou?r\s+barrier\b': 'moisture barrier vapour barrier air seal',
-            r'\bmoisture\s+barrier\b': 'vapour barrier moisture protection',
-            r'\bair\s+seal\b': 'airtight vapour barrier air sealing',
-            
-            # Acoustic performance
-            r'\bsound\s*proof\w*\b': 'acoustic soundproofing sound dampening noise reduction',
-            r'\bacoustic\b': 'soundproofing sound dampening acoustic performance',
-            r'\bnoise\s+reduct\w*\b': 'soundproofing acoustic sound dampening',
-            
-            # Installation and application
-            r'\binstal\w*\b': 'installation application install',
-            r'\bapplicat\w*\b': 'installation application install',
-            r'\bcuring\s+time\b': 'curing application installation',
-            r'\bsubstrate\b': 'surface application substrate preparation',
-            
-            # Geographic and service areas
-            r'\bvic\b': 'victoria melbourne braeside',
-            r'\btas\b': 'tasmania service area regional',
-            r'\bmelb\w*\b': 'melbourne victoria braeside',
-            r'\bbraeside\b': 'melbourne victoria service area',
-            r'\bregional\b': 'victoria regional service areas',
-            
-            # General abbreviations
-            r'\bdiy\b': 'do it yourself self install',
-            r'\bhvac\b': 'heating ventilation air conditioning',
-            r'\bpvc\b': 'polyvinyl chloride cable wiring',
-            r'\beps\b': 'expanded polystyrene foam insulation',
-            r'\bmould\b': 'mold moisture condensation',
-            r'\beffic\w*\b': 'efficiency performance effective'
-        }
-        
-        # Apply technical entity recognition
-        for pattern, expansion in technical_entities.items():
-            normalized = re.sub(pattern, expansion, normalized)
-        
-        # Final cleanup - remove extra spaces and normalize
-        normalized = re.sub(r'\s+', ' ', normalized).strip()
-        
-        return normalized
+        # Compiled single-pass entity expansion, memoized across calls
+        return default_normalizer.normalize(text)
+
+    def enhanced_fuzzy_search(self, query: str, text: str, category: str = "", quality_score: float = 0.0,
+                              fields: List[Tuple[str, float]] = None, is_corrupted: bool = None) -> Tuple[float, Dict[str, Any]]:
+        """Advanced fuzzy matching with quality integration and corruption detection
 
-    def enhanced_fuzzy_search(self, query: str, text: str, category: str = "", quality_score: float = 0.0) -> Tuple[float, Dict[str, Any]]:
-        """Advanced fuzzy matching with quality integration and corruption detection"""
+        With `fields` ((text, weight) pairs from get_searchable_fields) each fuzzy scorer runs
+        once per field and the field scores are combined by weight; `text` still feeds the bonuses.
+        Pass the item's stored is_corrupted flag to skip the regex scan.
+        """
         if not query or not text:
             return 0.0, {}
         
-        # Check for remaining corruption patterns
-        corruption_patterns = [
-            r'Make sure to include|provide citations|Customer:|Document ID|Metadata',
-            r'format the response|include citations|Formatting instructions'
-        ]
-        
-        has_corruption = any(re.search(pattern, text, re.IGNORECASE) for pattern in corruption_patterns)
-        if has_corruption:
+        # Check for remaining corruption patterns (flag from dataset load when available)
+        if is_corrupted is None:
+            is_corrupted = self._has_corruption(text)
+        if is_corrupted:
             return 0.0, {'corruption_detected': True}
         
         # Apply advanced text normalization
-        query_norm = self.normalize_text(query)
-        text_norm = self.normalize_text(text)
-        category_norm = self.normalize_text(category)
-        
-        # Dynamic multi-scorer fusion based on query characteristics
-        query_length = len(query_norm.split())
-        
-        # Adaptive weighting based on query length and type
-        if query_length <= 2:  # Short queries (1-2 words)
-            weights = {'token_set': 0.45, 'partial': 0.25, 'token_sort': 0.20, 'ratio': 0.10}
-        elif query_length <= 4:  # Medium queries (3-4 words)  
-            weights = {'token_set': 0.40, 'partial': 0.30, 'token_sort': 0.20, 'ratio': 0.10}
-        else:  # Long queries (5+ words)
-            weights = {'token_set': 0.30, 'partial': 0.40, 'token_sort': 0.20, 'ratio': 0.10}
-        
-        # Calculate multi-scorer fusion with improved fuzzy matching
-        token_set_score = fuzz.token_set_ratio(query_norm, text_norm)
-        partial_score = fuzz.partial_ratio(query_norm, text_norm)
-        token_sort_score = fuzz.token_sort_ratio(query_norm, text_norm)
-        ratio_score = fuzz.ratio(query_norm, text_norm)
-        
-        # Apply dynamic weighting
-        base_score = (
-            token_set_score * weights['token_set'] +
-            partial_score * weights['partial'] +
-            token_sort_score * weights['token_sort'] +
-            ratio_score * weights['ratio']
+        field_norms = [(self.normalize_text(field_text), weight) for field_text, weight in fields] if fields else None
+        components = self._fuzzy_components(
+            self.normalize_text(query), self.normalize_text(text), self.normalize_text(category), quality_score,
+            field_norms=field_norms
         )
-        
+        return components[0], self._fuzzy_scoring_details(components, quality_score)
+
+    def _has_corruption(self, text: str) -> bool:
+        """True if text matches any dataset_cleaner corruption pattern"""
+        return bool(detect_corruption(text))
+
+    def _fuzzy_bonuses(self, query_norm: str, query_words: set, text_norm: str, text_words: set,
+                       category_norm: str, quality_score: float, category_fallback: bool = True) -> Tuple[float, float, float, float]:
+        """Exact-match, category, keyword and quality bonuses - set arithmetic only, apart from the category fallback"""
         # Enhanced exact match detection
         exact_bonus = 0
-        query_words = set(query_norm.split())
-        text_words = set(text_norm.split())
-        
         if any(word in text_norm for word in query_words if len(word) > 3):
             word_match_ratio = len(query_words.intersection(text_words)) / len(query_words) if query_words else 0
             if word_match_ratio >= 0.9:
@@ -444,15 +389,13 @@ class YetifoamEnhancedResponseGenerator:
             
             if category_match_ratio >= 0.6:
                 category_bonus = 20
-            elif fuzz.partial_ratio(query_norm, category_norm) > 70:
+            elif category_fallback and fuzz.partial_ratio(query_norm, category_norm) > 70:
                 category_bonus = 10
         
         # Keyword density scoring
         keyword_bonus = 0
-        stop_words = {'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are', 'was', 'were', 'a', 'an'}
-        
-        meaningful_query_words = {w for w in query_words if w not in stop_words and len(w) > 2}
-        meaningful_text_words = {w for w in text_words if w not in stop_words and len(w) > 2}
+        meaningful_query_words = {w for w in query_words if w not in self.FUZZY_STOP_WORDS and len(w) > 2}
+        meaningful_text_words = {w for w in text_words if w not in self.FUZZY_STOP_WORDS and len(w) > 2}
         
         if meaningful_query_words:
             common_words = meaningful_query_words.intersection(meaningful_text_words)
@@ -472,6 +415,83 @@ class YetifoamEnhancedResponseGenerator:
         if quality_score > 0.7:  # High quality responses get boost
             quality_bonus = min((quality_score - 0.7) * 20, 10)  # Up to 10% boost
         
+        return exact_bonus, category_bonus, keyword_bonus, quality_bonus
+
+    def _fuzzy_components(self, query_norm: str, text_norm: str, category_norm: str, quality_score: float,
+                          can_beat=None, field_norms: List[Tuple[str, float]] = None) -> Optional[Tuple]:
+        """Full four-scorer fusion plus bonuses; returns (final_score, ...) without building the details dict
+
+        can_beat(upper_bound) lets a top-k caller abandon the row (None is returned) as soon as
+        its best possible final score cannot make the cut, before the expensive partial_ratio.
+        field_norms makes every scorer a field-weighted mean (each field scored once).
+        """
+        def score(scorer) -> float:
+            if field_norms:
+                return field_weighted_score(query_norm, field_norms, scorer)
+            return scorer(query_norm, text_norm)
+        
+        # Dynamic multi-scorer fusion based on query characteristics
+        query_length = len(query_norm.split())
+        
+        # Adaptive weighting based on query length and type
+        if query_length <= 2:  # Short queries (1-2 words)
+            weights = {'token_set': 0.45, 'partial': 0.25, 'token_sort': 0.20, 'ratio': 0.10}
+        elif query_length <= 4:  # Medium queries (3-4 words)  
+            weights = {'token_set': 0.40, 'partial': 0.30, 'token_sort': 0.20, 'ratio': 0.10}
+        else:  # Long queries (5+ words)
+            weights = {'token_set': 0.30, 'partial': 0.40, 'token_sort': 0.20, 'ratio': 0.10}
+        
+        # Bonuses are set arithmetic; the category partial_ratio fallback (+10) is deferred
+        exact_bonus, category_bonus, keyword_bonus, quality_bonus = self._fuzzy_bonuses(
+            query_norm, set(query_norm.split()), text_norm, set(text_norm.split()), category_norm, quality_score,
+            category_fallback=False
+        )
+        category_fallback = bool(category_norm) and not category_bonus
+        category_bound = 10 if category_fallback else category_bonus
+        
+        # Every fuzzy scorer is capped at 100, so check the bonus-only bound before running any of them
+        if can_beat is not None and not can_beat(self._fuzzy_final_score(
+                weights, 100, 100, 100, 100, exact_bonus, category_bound, keyword_bonus, quality_bonus)[2]):
+            return None
+        
+        # Calculate multi-scorer fusion with improved fuzzy matching (cheapest scorers first)
+        ratio_score = score(fuzz.ratio)
+        token_sort_score = score(fuzz.token_sort_ratio)
+        token_set_score = score(fuzz.token_set_ratio)
+        
+        # partial_ratio dominates the cost on long responses - skip it when even 100 cannot win
+        if can_beat is not None and not can_beat(self._fuzzy_final_score(
+                weights, token_set_score, 100, token_sort_score, ratio_score,
+                exact_bonus, category_bound, keyword_bonus, quality_bonus)[2]):
+            return None
+        
+        partial_score = score(fuzz.partial_ratio)
+        
+        # Category matching fallback
+        if category_fallback and fuzz.partial_ratio(query_norm, category_norm) > 70:
+            category_bonus = 10
+        
+        base_score, raw_score, final_score = self._fuzzy_final_score(
+            weights, token_set_score, partial_score, token_sort_score, ratio_score,
+            exact_bonus, category_bonus, keyword_bonus, quality_bonus
+        )
+        
+        return (final_score, query_length, weights, token_set_score, partial_score, token_sort_score, ratio_score,
+                base_score, exact_bonus, category_bonus, keyword_bonus, quality_bonus, raw_score)
+
+    @staticmethod
+    def _fuzzy_final_score(weights: Dict[str, float], token_set_score: float, partial_score: float,
+                           token_sort_score: float, ratio_score: float, exact_bonus: float, category_bonus: float,
+                           keyword_bonus: float, quality_bonus: float) -> Tuple[float, float, float]:
+        """(base, raw, final) score; monotone in every input so it also gives upper bounds"""
+        # Apply dynamic weighting
+        base_score = (
+            token_set_score * weights['token_set'] +
+            partial_score * weights['partial'] +
+            token_sort_score * weights['token_sort'] +
+            ratio_score * weights['ratio']
+        )
+        
         # Calculate final score
         raw_score = base_score + exact_bonus + category_bonus + keyword_bonus + quality_bonus
         
@@ -481,8 +501,13 @@ class YetifoamEnhancedResponseGenerator:
         else:
             final_score = min(raw_score, 100)
         
-        # Scoring details for debugging
-        scoring_details = {
+        return base_score, raw_score, final_score
+
+    def _fuzzy_scoring_details(self, components: Tuple, quality_score: float) -> Dict[str, Any]:
+        """Scoring details for debugging - only built for results that are returned"""
+        (final_score, query_length, weights, token_set_score, partial_score, token_sort_score, ratio_score,
+         base_score, exact_bonus, category_bonus, keyword_bonus, quality_bonus, raw_score) = components
+        return {
             'query_length': query_length,
             'weights_used': weights,
             'token_set_score': token_set_score,
@@ -496,55 +521,198 @@ class YetifoamEnhancedResponseGenerator:
             'quality_bonus': quality_bonus,
             'raw_score': raw_score,
             'final_score': final_score,
-            'corruption_detected': has_corruption,
+            'corruption_detected': False,
             'quality_score_used': quality_score
         }
+
+    @staticmethod
+    def _char_bigrams(text: str) -> set:
+        """Character bigrams - a cheap stand-in for the edit-distance scorers on short texts"""
+        return {text[i:i + 2] for i in range(len(text) - 1)}
+
+    def _get_fuzzy_rows(self, dataset: ResponseStore) -> List[Tuple]:
+        """Normalized fields, word sets and quality of every dataset row, built once per loaded dataset"""
+        rows = self._fuzzy_rows
+        if rows is None or rows[0] is not dataset or rows[2] != dataset.revision:
+            entries = []
+            for item in dataset:
+                fields = self.get_searchable_fields(item)
+                field_norms = [(self.normalize_text(text), weight) for text, weight in fields]
+                text_norm = ' '.join(text for text, _ in field_norms)
+                category_norm = self.normalize_text(item.get('category', ''))
+                # Stored quality is 0-100; the fuzzy bonus expects 0-1
+                quality_score = (item.get('quality_score') or 0.0) / 100
+                field_sets = [(set(text.split()), self._char_bigrams(text), weight) for text, weight in field_norms]
+                entries.append((
+                    text_norm, set(text_norm.split()), self._char_bigrams(text_norm), category_norm, quality_score,
+                    not fields or bool(item.get('is_corrupted')), field_norms, field_sets
+                ))
+            rows = (dataset, entries, dataset.revision)
+            self._fuzzy_rows = rows
+        return rows[1]
+
+    def rank_fuzzy_matches(self, query: str, max_results: int = 5, rerank_depth: int = None,
+                           exhaustive: bool = False, prune: bool = True) -> List[Dict[str, Any]]:
+        """Top fuzzy matches over the dataset using a cheap-first cascade
+
+        Stage 1 ranks every row by word/bigram overlap plus the exact-match, keyword,
+        category and quality bonuses; stage 2 runs the four-scorer fusion on the
+        best `rerank_depth` rows only, in stage 1 order, skipping rows whose score
+        upper bound cannot beat the current k-th best (prune=False disables this;
+        results are identical either way); stage 3 builds scoring details for the
+        returned rows. exhaustive=True runs stage 2 on every row instead.
+        """
+        if not query or not query.strip() or max_results < 1:
+            return []
         
-        return final_score, scoring_details
+        # Pin the current generation so a concurrent reload cannot change the rows mid-search
+        dataset = self.dataset
+        rows = self._get_fuzzy_rows(dataset)
+        query_norm = self.normalize_text(query)
+        query_words = set(query_norm.split())
+        query_bigrams = self._char_bigrams(query_norm)
+        live = [i for i, row in enumerate(rows) if not row[5] and i not in dataset.deleted]
+        
+        # Stage 1: cheap ordering (set arithmetic only, no edit-distance scorers)
+        def overlap(words: set, bigrams: set) -> float:
+            word_overlap = len(query_words & words) / len(query_words) * 100 if query_words else 0
+            bigram_dice = (
+                2 * len(query_bigrams & bigrams) / (len(query_bigrams) + len(bigrams)) * 100
+                if query_bigrams and bigrams else 0
+            )
+            return max(word_overlap, bigram_dice)
+        
+        def cheap_score(i: int) -> float:
+            text_norm, text_words, _, category_norm, quality_score, _, _, field_sets = rows[i]
+            # Weighted per field like the full fusion, so a question that matches outranks a long response that merely mentions the words
+            total_weight = sum(weight for _, _, weight in field_sets)
+            similarity = sum(overlap(words, bigrams) * weight for words, bigrams, weight in field_sets) / total_weight
+            return similarity + sum(self._fuzzy_bonuses(
+                query_norm, query_words, text_norm, text_words, category_norm, quality_score, category_fallback=False
+            ))
+        
+        # Most promising rows first so the k-th best score (the pruning threshold) rises early
+        if exhaustive:
+            live = sorted(live, key=cheap_score, reverse=True)
+        else:
+            live = heapq.nlargest(max(rerank_depth or self.fuzzy_rerank_depth, max_results), live, key=cheap_score)
+        
+        # Stage 2: full fusion with a min-heap of the current top results keyed (score, -row) so ties keep dataset order
+        top = []
+        
+        def can_beat(i: int, upper_bound: float) -> bool:
+            if upper_bound <= 0:
+                return False
+            return len(top) < max_results or (upper_bound, -i) > top[0][:2]
+        
+        for i in live:
+            text_norm, _, _, category_norm, quality_score, _, field_norms, _ = rows[i]
+            components = self._fuzzy_components(
+                query_norm, text_norm, category_norm, quality_score,
+                can_beat=partial(can_beat, i) if prune else None, field_norms=field_norms
+            )
+            if components is None or components[0] <= 0:
+                continue
+            entry = (components[0], -i, components)
+            if len(top) < max_results:
+                heapq.heappush(top, entry)
+            elif entry[:2] > top[0][:2]:
+                heapq.heapreplace(top, entry)
+        
+        # Stage 3: result dicts and scoring details only for what is returned
+        results = []
+        for final_score, negative_row, components in sorted(top, key=itemgetter(0, 1), reverse=True):
+            i = -negative_row
+            results.append(dataset.reference(
+                i,
+                confidence=final_score,
+                match_query=query,
+                match_type='fuzzy',
+                scoring_details=self._fuzzy_scoring_details(components, rows[i][4])
+            ))
+        return results
+
+    def get_searchable_fields(self, item: Dict[str, Any]) -> List[Tuple[str, float]]:
+        """(text, weight) for each searchable field in priority order - weights are applied when scoring"""
+        return weighted_fields(item)
 
     def get_searchable_text(self, item: Dict[str, Any]) -> str:
-        """Extract prioritized searchable text with weighted field importance"""
-        weighted_texts = []
-        
-        # Check if this is the new clean dataset structure
-        if 'response' in item and 'question' in item:
-            # New clean dataset structure - prioritize response and question
-            priority_fields = [
-                ('response', 0.60),              # Clean response - highest weight
-                ('question', 0.30),              # Question - medium weight  
-                ('category', 0.10),              # Category - lowest weight
-            ]
-        else:
-            # Legacy dataset structure
-            priority_fields = [
-                ('standardized_response', 0.50),  # Primary response - highest weight
-                ('inferred_question', 0.30),      # Generated questions - medium weight  
-                ('original_text', 0.20),          # Source text - lowest weight
-                ('response_text', 0.15),          # Alternative response - backup
-                ('category', 0.05)                # Category context - minimal weight
-            ]
-        
-        # Build weighted text combining based on field priority
-        for field, weight in priority_fields:
-            if field in item and item[field]:
-                text = str(item[field]).strip()
-                if text:
-                    # Repeat text based on weight to increase matching probability
-                    repetitions = max(1, int(weight * 5))  # Scale weight to repetitions
-                    weighted_texts.extend([text] * repetitions)
-        
-        # Combine all weighted texts
-        combined_text = ' '.join(weighted_texts)
-        return combined_text
+        """All searchable field text, each field once (for word/substring checks)"""
+        return ' '.join(text for text, _ in self.get_searchable_fields(item))
+
+    def search_responses(self, query: str, confidence_threshold: float = 0.70, max_results: int = 5,
+                         retriever: str = 'fuzzy') -> List[Dict[str, Any]]:
+        """Search using complete matcher - evaluates ALL responses, never fails
 
-    def search_responses(self, query: str, confidence_threshold: float = 0.70, max_results: int = 5) -> List[Dict[str, Any]]:
-        """Search using complete matcher - evaluates ALL responses, never fails"""
-        if not query or not self.complete_matcher:
+        retriever='bm25' ranks responses with the sparse BM25 index first and only
+        re-ranks its top candidates with the fuzzy scorers.
+        """
+        complete_matcher = self.complete_matcher
+        if not query or not complete_matcher:
             return []
         
-        # Get best match from ALL responses
-        best_result = self.complete_matcher.find_best_match_from_all(query)
-        
+        # Best match and additional matches come from a single scoring pass over ALL responses
+        best_result, top_matches = complete_matcher.find_best_with_alternatives(query, max_results, retriever)
+        return self._format_search_results(query, best_result, top_matches, max_results)
+    
+    def _get_bulk_executor(self, complete_matcher: CompleteMatcher) -> Optional[BulkExecutor]:
+        """Worker pool for the matcher's dataset, or None when bulk queries should run in-process
+
+        Workers load the dataset file, so a matcher holding unsaved in-memory updates is searched
+        in-process. The pool is kept between runs and replaced when a new dataset version is loaded.
+        """
+        if self.bulk_workers < 2 or not complete_matcher.matches_source():
+            return None
+        with self._lock:
+            executor = self._bulk_executor
+            if executor is None or executor.dataset_version != complete_matcher.dataset_version:
+                if executor is not None:
+                    executor.shutdown()
+                executor = self._bulk_executor = BulkExecutor(
+                    complete_matcher.dataset_path, complete_matcher.dataset_version, self.bulk_workers
+                )
+            return executor
+    
+    def _drop_bulk_executor(self, executor: BulkExecutor):
+        with self._lock:
+            if self._bulk_executor is executor:
+                self._bulk_executor = None
+        executor.shutdown()
+    
+    def process_bulk_queries(self, queries: List[str], confidence_threshold: float = 0.70,
+                             max_results: int = 5) -> Iterator[Tuple[str, List[Dict[str, Any]], float]]:
+        """Search every query and yield (query, results, seconds) in input order as results arrive
+
+        Large jobs are sharded across worker processes; small jobs and anything the pool cannot
+        serve are searched here. Both run bulk_executor.search_queries, so results do not depend on
+        where a query ran.
+        """
+        complete_matcher = self.complete_matcher
+        if not complete_matcher:
+            for query in queries:
+                yield query, [], 0.0
+            return
+        
+        done = 0
+        executor = self._get_bulk_executor(complete_matcher) if len(queries) >= self.bulk_parallel_min_queries else None
+        if executor is not None:
+            try:
+                for query, (best_result, top_matches), seconds in executor.map(queries, max_results):
+                    results = self._format_search_results(query, best_result, top_matches, max_results) if query else []
+                    yield query, results, seconds
+                    done += 1
+            except Exception as e:
+                # A broken or stale pool is discarded; the remaining queries are searched here
+                logging.warning(f"Bulk worker pool failed after {done} queries, continuing in-process: {e}")
+                self._drop_bulk_executor(executor)
+        
+        remaining = queries[done:]
+        for query, ((best_result, top_matches), seconds) in zip(remaining, search_queries(complete_matcher, remaining, max_results)):
+            results = self._format_search_results(query, best_result, top_matches, max_results) if query else []
+            yield query, results, seconds
+    
+    def _format_search_results(self, query: str, best_result: Dict[str, Any], top_matches: List[Dict[str, Any]], max_results: int) -> List[Dict[str, Any]]:
+        """Convert matcher output into the UI result format"""
         # Convert to expected UI format
         results = []
         if best_result['success']:
@@ -563,14 +731,13 @@ class YetifoamEnhancedResponseGenerator:
         
         # Get additional matches if requested
         if max_results > 1:
-            additional_matches = self.complete_matcher.get_multiple_matches(query, max_results)
-            for i, match in enumerate(additional_matches[1:], 2):  # Skip first (already added)
+            for match in top_matches[1:]:  # Skip first (already added)
                 if match['score'] >= 40:  # Only include reasonable matches
                     result = {
                         'confidence': match['score'],
                         'match_query': query,
                         'category': match['category'],
-                        'response': match['response'],
+                        'response': match['response_text'],
                         'query': query,
                         'quality_score': 80.0,
                         'match_type': 'additional',
@@ -586,7 +753,8 @@ class YetifoamEnhancedResponseGenerator:
         exact_results = []
         query_lower = query.lower()
         
-        for item in self.dataset:
+        dataset = self.dataset
+        for item in dataset.live_rows():
             searchable_text = self.get_searchable_text(item).lower()
             
             # Check for exact word matches
@@ -601,13 +769,17 @@ class YetifoamEnhancedResponseGenerator:
                     confidence = min(85 + (exact_ratio * 15), 100)  # 85-100% confidence
                     
                     if confidence >= confidence_threshold * 100:
-                        result = item.copy()
-                        result['confidence'] = confidence
-                        result['match_query'] = query
-                        result['match_type'] = 'exact_fallback'
-                        result['exact_ratio'] = exact_ratio
-                        result['quality_score'] = self.calculate_quality_score(self.get_response_text(item), item.get('category', ''))
-                        exact_results.append(result)
+                        quality_score = item.get('quality_score')
+                        if quality_score is None:
+                            quality_score = self.calculate_quality_score(self.get_response_text(item), item.get('category', ''))
+                        exact_results.append(dataset.reference(
+                            item.row_id,
+                            confidence=confidence,
+                            match_query=query,
+                            match_type='exact_fallback',
+                            exact_ratio=exact_ratio,
+                            quality_score=quality_score
+                        ))
         
         return exact_results
 
@@ -646,26 +818,31 @@ class YetifoamEnhancedResponseGenerator:
     def rate_limit(self, max_calls: int = 10, time_window: int = 60):
         """Rate limiting decorator for API calls"""
         def decorator(func):
-            if not hasattr(self, 'rate_limit_calls'):
-                self.rate_limit_calls = {}
+            with self._lock:
+                if not hasattr(self, 'rate_limit_calls'):
+                    self.rate_limit_calls = {}
             
             @wraps(func)
             def wrapper(*args, **kwargs):
                 now = time.time()
                 user_id = st.session_state.get('username', 'anonymous')
                 
-                if user_id not in self.rate_limit_calls:
-                    self.rate_limit_calls[user_id] = []
-                
-                # Clean old calls
-                self.rate_limit_calls[user_id] = [call for call in self.rate_limit_calls[user_id] 
-                                                 if now - call < time_window]
+                with self._lock:
+                    if user_id not in self.rate_limit_calls:
+                        self.rate_limit_calls[user_id] = []
+                    
+                    # Clean old calls
+                    self.rate_limit_calls[user_id] = [call for call in self.rate_limit_calls[user_id] 
+                                                     if now - call < time_window]
+                    
+                    limited = len(self.rate_limit_calls[user_id]) >= max_calls
+                    if not limited:
+                        self.rate_limit_calls[user_id].append(now)
                 
-                if len(self.rate_limit_calls[user_id]) >= max_calls:
+                if limited:
                     st.error(f"⚠️ Rate limit exceeded. Maximum {max_calls} requests per {time_window} seconds.")
                     return None
                     
-                self.rate_limit_calls[user_id].append(now)
                 return func(*args, **kwargs)
             return wrapper
         return decorator
@@ -692,6 +869,11 @@ class YetifoamEnhancedResponseGenerator:
 
     def export_to_pdf(self, data: List[Dict[str, Any]], title: str = "Yetifoam Response Export") -> bytes:
         """Export responses to PDF format"""
+        # reportlab is only loaded when a PDF is actually requested
+        from reportlab.lib.pagesizes import A4
+        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak
+        
         buffer = BytesIO()
         doc = SimpleDocTemplate(buffer, pagesize=A4)
         styles = getSampleStyleSheet()
@@ -773,6 +955,7 @@ class YetifoamEnhancedResponseGenerator:
             }
             df_data.append(row)
         
+        import pandas as pd
         df = pd.DataFrame(df_data)
         return df.to_csv(index=False)
 
@@ -804,6 +987,17 @@ class YetifoamEnhancedResponseGenerator:
         
         return "\n".join(output)
 
+@st.cache_resource(show_spinner="Loading response engine...")
+def get_shared_generator() -> YetifoamEnhancedResponseGenerator:
+    """Process-wide generator shared by every session; per-session state lives in st.session_state"""
+    with timed("YetifoamEnhancedResponseGenerator"):
+        generator = YetifoamEnhancedResponseGenerator()
+    # Printed once per process when YETIFOAM_STARTUP_TIMING is set
+    report_startup_timing()
+    # New parquet content published by the data team is picked up without a restart
+    generator.start_auto_reload(float(os.environ.get('YETIFOAM_RELOAD_INTERVAL', '5')))
+    return generator
+
 def setup_logging():
     """Setup application logging"""
     logging.basicConfig(
@@ -816,6 +1010,101 @@ def generate_session_id() -> str:
     """Generate unique session ID"""
     return secrets.token_urlsafe(16)
 
+class BulkRun:
+    """Results and running totals of one bulk job, kept up to date as each query finishes"""
+    
+    # Minimum time between summary redraws (tables and exports are rebuilt on every redraw)
+    REFRESH_SECONDS = 1.0
+    
+    def __init__(self, total_queries: int):
+        self.total_queries = total_queries
+        self.queries_done = 0
+        self.results = []
+        self.summary_rows = []
+        self.query_seconds = []
+        self.confidence_total = 0.0
+        self.quality_total = 0.0
+        self.started = time.perf_counter()
+        self.first_result_seconds = None
+    
+    def add(self, results: List[Dict[str, Any]], seconds: float):
+        """Record one finished query"""
+        self.queries_done += 1
+        self.query_seconds.append(seconds)
+        if results and self.first_result_seconds is None:
+            self.first_result_seconds = time.perf_counter() - self.started
+        for result in results:
+            self.results.append(result)
+            self.confidence_total += result.get('confidence', 0)
+            self.quality_total += result.get('quality_score', 0)
+            self.summary_rows.append({
+                'Query': result.get('match_query', ''),
+                'Category': result.get('category', ''),
+                'Confidence': f"{result.get('confidence', 0):.1f}%",
+                'Quality': f"{result.get('quality_score', 0):.1f}%"
+            })
+    
+    @property
+    def finished(self) -> bool:
+        return self.queries_done >= self.total_queries
+    
+    @property
+    def avg_confidence(self) -> float:
+        return self.confidence_total / len(self.results) if self.results else 0.0
+    
+    @property
+    def avg_quality(self) -> float:
+        return self.quality_total / len(self.results) if self.results else 0.0
+    
+    def timing_text(self) -> str:
+        """Total, first-result and per-query timings for display"""
+        if not self.query_seconds:
+            return ""
+        first_result = f" · first result after {self.first_result_seconds:.1f}s" if self.first_result_seconds is not None else ""
+        return (f"⏱️ {time.perf_counter() - self.started:.1f}s total{first_result} · "
+                f"{sum(self.query_seconds) / len(self.query_seconds) * 1000:.0f} ms average and "
+                f"{max(self.query_seconds) * 1000:.0f} ms slowest per query")
+
+def show_bulk_results(generator: YetifoamEnhancedResponseGenerator, bulk_run: BulkRun, placeholder):
+    """Render the bulk summary, table and exports for the results so far into a placeholder"""
+    if not bulk_run.results:
+        return
+    
+    with placeholder.container():
+        # Enhanced results summary with quality metrics
+        col_metric1, col_metric2, col_metric3 = st.columns(3)
+        with col_metric1:
+            st.metric("Total Results", len(bulk_run.results))
+        with col_metric2:
+            st.metric("Avg Confidence", f"{bulk_run.avg_confidence:.1f}%")
+        with col_metric3:
+            st.metric("Avg Quality", f"{bulk_run.avg_quality:.1f}%")
+        
+        import pandas as pd
+        st.dataframe(pd.DataFrame(bulk_run.summary_rows))
+        
+        # Enhanced bulk export options - available for the partial results while the run continues
+        if bulk_run.finished:
+            st.subheader("📦 Export Enhanced Bulk Results")
+        else:
+            st.subheader(f"📦 Export Partial Results ({bulk_run.queries_done}/{bulk_run.total_queries} queries)")
+        col_export1, col_export2, col_export3 = st.columns(3)
+        
+        # Each redraw creates new buttons, so their keys carry the progress; downloading does not
+        # rerun the script (a rerun would stop the job)
+        key = f"bulk_{bulk_run.queries_done}"
+        with col_export1:
+            json_data, filename = generator.export_to_json(bulk_run.results, "bulk_enhanced_responses.json")
+            st.download_button("📄 Bulk JSON", json_data, filename, "application/json", key=f"{key}_json", on_click="ignore")
+        
+        with col_export2:
+            csv_data = generator.export_to_csv(bulk_run.results)
+            st.download_button("📊 Bulk CSV", csv_data, "bulk_enhanced_responses.csv", "text/csv", key=f"{key}_csv", on_click="ignore")
+        
+        with col_export3:
+            txt_data = generator.export_to_txt(bulk_run.results)
+            st.download_button("📝 Bulk TXT", txt_data, "bulk_enhanced_responses.txt", "text/plain", key=f"{key}_txt", on_click="ignore")
+
 def main():
     """Main Streamlit application with enhanced features"""
     
@@ -847,7 +1136,7 @@ def main():
                 
                 if login_button:
                     if username and password:
-                        generator = YetifoamEnhancedResponseGenerator()
+                        generator = get_shared_generator()
                         auth_result = generator.authenticate_user(username, password)
                         
                         if auth_result["success"]:
@@ -906,16 +1195,17 @@ def main():
     
     # Main application (only if authenticated)
     if st.session_state.authenticated:
-        # Initialize generator
-        generator = YetifoamEnhancedResponseGenerator()
+        # Shared generator - built once per process, not on every rerun
+        generator = get_shared_generator()
+        generator.show_load_status()
         
         # Display dataset info
         with st.sidebar:
             st.header("📊 Enhanced Dataset Info")
-            st.info(f"**Total Responses:** {len(generator.dataset)}")
+            st.info(f"**Total Responses:** {len(generator.dataset.live_ids())}")
             if generator.dataset:
                 categories = set()
-                for item in generator.dataset:
+                for item in generator.dataset.live_rows():
                     if 'category' in item:
                         categories.add(item['category'])
                 st.info(f"**Categories:** {len(categories)}")
@@ -951,6 +1241,13 @@ def main():
             with col2:
                 confidence = st.slider("Quality Threshold", 0.5, 1.0, 0.70, 0.05)
                 max_results = st.selectbox("Max Results", [3, 5, 10, 15], index=1)
+                retriever = st.selectbox(
+                    "Retrieval Engine",
+                    ['fuzzy', 'bm25'],
+                    format_func=lambda name: {'fuzzy': "Fuzzy (all responses)", 'bm25': "BM25 + fuzzy re-rank"}[name],
+                    disabled=generator.complete_matcher is None or generator.complete_matcher.bm25 is None,
+                    help="BM25 needs numpy and scipy installed"
+                )
                 show_scoring = st.checkbox("Show Scoring Details", value=False)
                 search_button = st.button("🔍 Generate Enhanced Response", type="primary")
                 
@@ -965,7 +1262,7 @@ def main():
                 # Rate limiting check
                 @generator.rate_limit(max_calls=20, time_window=60)
                 def perform_search():
-                    return generator.search_responses(query, confidence, max_results)
+                    return generator.search_responses(query, confidence, max_results, retriever)
                 
                 with st.spinner("Searching with enhanced algorithm..."):
                     results = perform_search()
@@ -1032,6 +1329,7 @@ def main():
                         if show_scoring and 'scoring_details' in result:
                             with st.expander("📊 View Scoring Details"):
                                 details = result['scoring_details']
+                                import pandas as pd
                                 scoring_df = pd.DataFrame([{
                                     'Metric': 'Token Set Score',
                                     'Value': f"{details.get('token_set_score', 0):.1f}%"
@@ -1118,57 +1416,27 @@ def main():
                     # Log bulk processing start
                     generator.log_user_activity("bulk_process_start", f"Processing {len(queries)} queries")
                     
-                    all_results = []
+                    bulk_run = BulkRun(len(queries))
                     progress_bar = st.progress(0)
+                    # Re-rendered in place while results stream in; the last render stays as the final view
+                    summary_placeholder = st.empty()
                     
-                    for i, query in enumerate(queries):
-                        results = generator.search_responses(query, bulk_confidence, bulk_max_results)
-                        all_results.extend(results)
-                        progress_bar.progress((i + 1) / len(queries))
+                    # Results arrive in query order (from the worker pool for large jobs); the summary is
+                    # redrawn with the first result and then at most once per refresh interval
+                    last_render = 0.0
+                    for query, results, seconds in generator.process_bulk_queries(queries, bulk_confidence, bulk_max_results):
+                        bulk_run.add(results, seconds)
+                        progress_bar.progress(bulk_run.queries_done / len(queries),
+                                              text=f"{bulk_run.queries_done}/{len(queries)} queries")
+                        if time.perf_counter() - last_render >= BulkRun.REFRESH_SECONDS or bulk_run.queries_done == len(queries):
+                            show_bulk_results(generator, bulk_run, summary_placeholder)
+                            last_render = time.perf_counter()
                     
                     # Log bulk processing completion
-                    generator.log_user_activity("bulk_process_complete", f"Processed {len(queries)} queries, found {len(all_results)} results")
-                    
-                    st.success(f"Processed {len(queries)} queries, found {len(all_results)} total responses")
+                    generator.log_user_activity("bulk_process_complete", f"Processed {len(queries)} queries, found {len(bulk_run.results)} results")
                     
-                    # Enhanced results summary with quality metrics
-                    if all_results:
-                        avg_confidence = sum(r.get('confidence', 0) for r in all_results) / len(all_results)
-                        avg_quality = sum(r.get('quality_score', 0) for r in all_results) / len(all_results)
-                        
-                        col_metric1, col_metric2, col_metric3 = st.columns(3)
-                        with col_metric1:
-                            st.metric("Total Results", len(all_results))
-                        with col_metric2:
-                            st.metric("Avg Confidence", f"{avg_confidence:.1f}%")
-                        with col_metric3:
-                            st.metric("Avg Quality", f"{avg_quality:.1f}%")
-                        
-                        df_summary = pd.DataFrame([
-                            {
-                                'Query': result.get('match_query', ''),
-                                'Category': result.get('category', ''),
-                                'Confidence': f"{result.get('confidence', 0):.1f}%",
-                                'Quality': f"{result.get('quality_score', 0):.1f}%"
-                            } for result in all_results
-                        ])
-                        st.dataframe(df_summary)
-                        
-                        # Enhanced bulk export options
-                        st.subheader("📦 Export Enhanced Bulk Results")
-                        col_export1, col_export2, col_export3 = st.columns(3)
-                        
-                        with col_export1:
-                            json_data, filename = generator.export_to_json(all_results, "bulk_enhanced_responses.json")
-                            st.download_button("📄 Bulk JSON", json_data, filename, "application/json")
-                        
-                        with col_export2:
-                            csv_data = generator.export_to_csv(all_results)
-                            st.download_button("📊 Bulk CSV", csv_data, "bulk_enhanced_responses.csv", "text/csv")
-                        
-                        with col_export3:
-                            txt_data = generator.export_to_txt(all_results)
-                            st.download_button("📝 Bulk TXT", txt_data, "bulk_enhanced_responses.txt", "text/plain")
+                    st.success(f"Processed {len(queries)} queries, found {len(bulk_run.results)} total responses")
+                    st.caption(bulk_run.timing_text())
         
         with tab3:
             st.header("📊 Quality Analytics Dashboard")
@@ -1177,29 +1445,15 @@ def main():
                 # Enhanced quality analysis
                 st.subheader("Dataset Quality Analysis")
                 
-                total_items = len(generator.dataset)
-                quality_scores = []
-                category_quality = {}
+                # Scores and aggregates were computed once at dataset build/load time
+                summary = generator.quality_summary
+                total_items = summary['total_items']
                 
-                # Calculate quality scores for all items
-                with st.spinner("Analyzing dataset quality..."):
-                    for item in generator.dataset:
-                        response_text = generator.get_response_text(item)
-                        category = item.get('category', 'Unknown')
-                        
-                        if response_text:
-                            quality = generator.calculate_quality_score(response_text, category)
-                            quality_scores.append(quality)
-                            
-                            if category not in category_quality:
-                                category_quality[category] = []
-                            category_quality[category].append(quality)
-                
-                if quality_scores:
-                    avg_quality = sum(quality_scores) / len(quality_scores)
-                    high_quality = len([q for q in quality_scores if q >= 70])
-                    medium_quality = len([q for q in quality_scores if 50 <= q < 70])
-                    low_quality = len([q for q in quality_scores if q < 50])
+                if summary['scored_items']:
+                    avg_quality = summary['avg_quality']
+                    high_quality = summary['high_quality']
+                    medium_quality = summary['medium_quality']
+                    low_quality = summary['low_quality']
                     
                     # Quality metrics
                     col_qual1, col_qual2, col_qual3, col_qual4 = st.columns(4)
@@ -1213,6 +1467,7 @@ def main():
                         st.metric("Low Quality (<50%)", f"{low_quality} ({low_quality/total_items*100:.1f}%)")
                     
                     # Quality distribution chart
+                    import pandas as pd
                     quality_dist = pd.DataFrame({
                         'Quality Range': ['High (≥70%)', 'Medium (50-70%)', 'Low (<50%)'],
                         'Count': [high_quality, medium_quality, low_quality]
@@ -1221,10 +1476,7 @@ def main():
                     
                     # Category quality breakdown
                     st.subheader("Quality by Category")
-                    category_avg = {}
-                    for cat, scores in category_quality.items():
-                        if scores:
-                            category_avg[cat] = sum(scores) / len(scores)
+                    category_avg = summary['category_avg']
                     
                     if category_avg:
                         cat_df = pd.DataFrame(list(category_avg.items()), columns=['Category', 'Average Quality'])
@@ -1239,7 +1491,7 @@ def main():
                 col_mon1, col_mon2, col_mon3, col_mon4 = st.columns(4)
                 
                 with col_mon1:
-                    st.metric("Dataset Size", len(generator.dataset))
+                    st.metric("Dataset Size", len(generator.dataset.live_ids()))
                 
                 with col_mon2:
                     # Security status
@@ -1259,14 +1511,25 @@ def main():
                         minutes = int((datetime.now() - last_activity).total_seconds() / 60)
                         st.metric("Session Age (min)", minutes)
                 
+                # Search cache effectiveness
+                cache_stats = search_cache.stats()
+                col_cache1, col_cache2, col_cache3 = st.columns(3)
+                with col_cache1:
+                    st.metric("Search Cache Hits", cache_stats['hits'])
+                with col_cache2:
+                    st.metric("Search Cache Misses", cache_stats['misses'])
+                with col_cache3:
+                    st.metric("Cache Hit Rate", f"{cache_stats['hit_rate']:.1f}%")
+                
                 # Export monitoring report
                 if st.button("📊 Export System Report"):
                     report = {
                         'timestamp': datetime.now().isoformat(),
                         'system_status': {
-                            'dataset_size': len(generator.dataset),
+                            'dataset_size': len(generator.dataset.live_ids()),
                             'security_secure': secure,
-                            'failed_attempts': failed_count
+                            'failed_attempts': failed_count,
+                            'search_cache': cache_stats
                         },
                         'user_info': {
                             'current_user': st.session_state.get('username'),
@@ -1314,14 +1577,17 @@ def main():
             with col_set2:
                 st.subheader("Dataset Information")
                 st.write(f"**Primary Dataset:** Enhanced Final Dataset")
-                st.write(f"**Total Items Loaded:** {len(generator.dataset)}")
+                st.write(f"**Total Items Loaded:** {len(generator.dataset.live_ids())}")
+                st.write(f"**Dataset Generation:** {generator.engine.number} (loaded {generator.engine.loaded_at:%H:%M:%S})")
                 st.write(f"**Search Fields:** standardized_response, response_text, original_text")
                 
                 if st.button("🔄 Reload Dataset"):
                     generator.log_user_activity("reload_dataset", "User reloaded dataset")
-                    count = generator.load_dataset()
-                    st.success(f"Reloaded {count} items")
-                    st.rerun()
+                    # Built in the background; every session switches to it once it is ready
+                    if generator.reload_in_background():
+                        st.success("Reload started - searches keep using the current dataset until it is ready")
+                    else:
+                        st.info("A reload is already in progress")
                 
                 st.subheader("Performance Improvements")
                 st.success("✅ Multi-field response text detection")